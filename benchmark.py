@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Benchmark and load-test harness for the AI Prescription Verifier API.
+
+Usage:
+    python benchmark.py corpus --size 500 --seed 42 --output corpus.jsonl
+    python benchmark.py load --corpus corpus.jsonl --concurrency 8 --output results.json
+    python benchmark.py load --stub --size 200      # self-contained run against a local stub API
+
+The load command reports throughput and p50/p95/p99 latency per endpoint, plus
+per-stage server timings when the backend returns a ``timings`` block, and writes
+everything to a JSON file so runs can be compared.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import re
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_BASE_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
+API_KEY = os.getenv("API_KEY", "MediGuard_Hackathon_2024_SecureKey")
+
+DRUGS = [
+    ("Atorvastatin", ["10mg", "20mg", "40mg"]), ("Clarithromycin", ["250mg", "500mg"]),
+    ("Metformin", ["500mg", "850mg", "1000mg"]), ("Lisinopril", ["5mg", "10mg", "20mg"]),
+    ("Aspirin", ["81mg", "325mg"]), ("Ibuprofen", ["200mg", "400mg", "600mg"]),
+    ("Acetaminophen", ["250mg", "500mg", "650mg"]), ("Warfarin", ["2mg", "5mg"]),
+    ("Cimetidine", ["200mg", "400mg"]), ("Furosemide", ["20mg", "40mg"]),
+    ("Amlodipine", ["5mg", "10mg"]), ("Simvastatin", ["20mg", "40mg"]),
+    ("Omeprazole", ["20mg", "40mg"]), ("Levothyroxine", ["50mcg", "100mcg"]),
+    ("Amoxicillin", ["250mg", "500mg"]), ("Sertraline", ["50mg", "100mg"]),
+    ("Digoxin", ["0.125mg", "0.25mg"]), ("Fluconazole", ["150mg", "200mg"]),
+    ("Prednisone", ["5mg", "20mg"]), ("Clopidogrel", ["75mg"]),
+    ("Losartan", ["25mg", "50mg"]), ("Gabapentin", ["300mg", "600mg"]),
+]
+FREQUENCIES = ["daily", "once daily", "twice daily", "three times daily", "every 6 hours as needed", "at bedtime", "BD"]
+DURATIONS = ["", " for 5 days", " for 7 days", " for 14 days"]
+INDICATIONS = ["hypertension", "type 2 diabetes", "arthritis pain", "bacterial infection", "atrial fibrillation", "hyperlipidemia"]
+PREFIXES = ["Rx:", "Prescription:", "Medications:", "Current medications:"]
+
+STAGE_PERCENTILES = (50, 95, 99)
+
+
+def generate_corpus(size: int, seed: int, min_drugs: int = 1, max_drugs: int = 20) -> List[Dict[str, Any]]:
+    """Seeded synthetic prescriptions with 1-20 drugs and varying text length"""
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(size):
+        drug_count = rng.randint(min_drugs, min(max_drugs, len(DRUGS)))
+        lines = []
+        for name, strengths in rng.sample(DRUGS, drug_count):
+            lines.append(f"{name} {rng.choice(strengths)} {rng.choice(FREQUENCIES)}{rng.choice(DURATIONS)}")
+        age = rng.choice([rng.randint(2, 11), rng.randint(18, 64), rng.randint(65, 90)])
+        notes = ", ".join(rng.sample(INDICATIONS, rng.randint(0, 3)))
+        text = f"{rng.choice(PREFIXES)} " + ", ".join(lines) + f". Patient age {age}."
+        if notes:
+            text += f" History of {notes}."
+        corpus.append({"id": i, "prescription_text": text, "patient_age": age, "drug_count": drug_count})
+    return corpus
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def percentiles(values: List[float], points=STAGE_PERCENTILES) -> Dict[str, Optional[float]]:
+    if not values:
+        return {f"p{p}": None for p in points}
+    if len(values) == 1:
+        return {f"p{p}": round(values[0], 2) for p in points}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {f"p{p}": round(cuts[p - 1], 2) for p in points}
+
+
+def run_load(base_url: str, corpus: List[Dict[str, Any]], endpoints: List[str], concurrency: int,
+             requests_per_endpoint: int, warmup: int) -> Dict[str, Any]:
+    """Drive each endpoint with a fixed number of concurrent workers and collect latencies"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    headers = {"x-api-key": API_KEY, "Content-Type": "application/json"}
+
+    def call(endpoint: str, item: Dict[str, Any]) -> Dict[str, Any]:
+        payload = {"prescription_text": item["prescription_text"]}
+        if endpoint != "check_interactions":
+            payload["patient_age"] = item.get("patient_age")
+        started = time.perf_counter()
+        try:
+            response = session.post(f"{base_url}/{endpoint}", headers=headers, json=payload, timeout=(3.05, 60))
+            latency_ms = (time.perf_counter() - started) * 1000
+            ok = response.status_code == 200
+            timings = response.json().get("timings", {}) if ok else {}
+            return {"ok": ok, "latency_ms": latency_ms, "timings": timings, "drug_count": item.get("drug_count")}
+        except (requests.RequestException, ValueError):
+            return {"ok": False, "latency_ms": (time.perf_counter() - started) * 1000, "timings": {}, "drug_count": item.get("drug_count")}
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for endpoint in endpoints:
+            for item in corpus[:warmup]:
+                call(endpoint, item)
+
+            items = [corpus[i % len(corpus)] for i in range(requests_per_endpoint)]
+            started = time.perf_counter()
+            samples = list(pool.map(lambda item: call(endpoint, item), items))
+            elapsed = time.perf_counter() - started
+
+            latencies = [s["latency_ms"] for s in samples if s["ok"]]
+            stages: Dict[str, List[float]] = {}
+            for sample in samples:
+                for stage, duration in sample["timings"].items():
+                    stages.setdefault(stage, []).append(float(duration))
+
+            by_drug_count: Dict[int, List[float]] = {}
+            for sample in samples:
+                if sample["ok"] and sample["drug_count"] is not None:
+                    by_drug_count.setdefault(sample["drug_count"], []).append(sample["latency_ms"])
+
+            results[endpoint] = {
+                "requests": len(samples),
+                "errors": len(samples) - len(latencies),
+                "elapsed_s": round(elapsed, 3),
+                "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+                "latency_ms": {
+                    "mean": round(statistics.fmean(latencies), 2) if latencies else None,
+                    **percentiles(latencies)
+                },
+                "stages_ms": {stage: percentiles(values) for stage, values in sorted(stages.items())},
+                "latency_by_drug_count_ms": {
+                    str(count): percentiles(values) for count, values in sorted(by_drug_count.items())
+                }
+            }
+    session.close()
+    return results
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Deterministic local stand-in for the verification API
+
+    Extracts drugs by matching the benchmark lexicon, so the harness can be
+    exercised without the NER model, Watson NLU or RxNav.
+    """
+
+    DRUG_PATTERN = re.compile(r"\b(" + "|".join(name for name, _ in DRUGS) + r")\b", re.IGNORECASE)
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any]):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "healthy", "ready": True})
+        else:
+            self._send(404, {"detail": "Not Found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        started = time.perf_counter()
+        medicines = sorted({m.title() for m in self.DRUG_PATTERN.findall(payload.get("prescription_text", ""))})
+        extraction_ms = (time.perf_counter() - started) * 1000
+
+        if self.path == "/check_interactions":
+            interactions = [
+                {"drug_a": a, "drug_b": b, "severity": "WARNING", "mechanism": "stub", "reference": "stub"}
+                for i, a in enumerate(medicines) for b in medicines[i + 1:]
+                if (len(a) + len(b)) % 5 == 0
+            ]
+            total_ms = (time.perf_counter() - started) * 1000
+            self._send(200, {
+                "extracted_medicines": medicines,
+                "interactions": interactions,
+                "total_interactions": len(interactions),
+                "alerts": [],
+                "timings": {"ner_ms": extraction_ms, "ddi_lookup_ms": total_ms - extraction_ms, "total_ms": total_ms}
+            })
+        elif self.path == "/check_dosage":
+            total_ms = (time.perf_counter() - started) * 1000
+            self._send(200, {
+                "extracted_medicines": medicines,
+                "dosage_recommendations": [],
+                "alternatives": [],
+                "timings": {"ner_ms": extraction_ms, "dosage_rules_ms": total_ms - extraction_ms, "total_ms": total_ms}
+            })
+        else:
+            self._send(404, {"detail": "Not Found"})
+
+
+def start_stub_server() -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the AI Prescription Verifier API")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    corpus_parser = subparsers.add_parser("corpus", help="generate a synthetic prescription corpus (JSONL)")
+    corpus_parser.add_argument("--size", type=int, default=500)
+    corpus_parser.add_argument("--seed", type=int, default=42)
+    corpus_parser.add_argument("--output", default="corpus.jsonl")
+
+    load_parser = subparsers.add_parser("load", help="run a concurrent load test and write results as JSON")
+    load_parser.add_argument("--url", default=API_BASE_URL)
+    load_parser.add_argument("--corpus", help="JSONL corpus file (generated on the fly when omitted)")
+    load_parser.add_argument("--size", type=int, default=200, help="corpus size when generating on the fly")
+    load_parser.add_argument("--seed", type=int, default=42)
+    load_parser.add_argument("--endpoints", nargs="+", default=["check_interactions", "check_dosage"])
+    load_parser.add_argument("--concurrency", type=int, default=8)
+    load_parser.add_argument("--requests", type=int, default=200, help="requests per endpoint")
+    load_parser.add_argument("--warmup", type=int, default=5, help="unmeasured requests per endpoint")
+    load_parser.add_argument("--stub", action="store_true", help="run against a local stub API instead of --url")
+    load_parser.add_argument("--output", default=f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+
+    args = parser.parse_args()
+
+    if args.command == "corpus":
+        corpus = generate_corpus(args.size, args.seed)
+        with open(args.output, "w", encoding="utf-8") as f:
+            for item in corpus:
+                f.write(json.dumps(item) + "\n")
+        print(f"Wrote {len(corpus)} prescriptions to {args.output}")
+        return
+
+    corpus = load_corpus(args.corpus) if args.corpus else generate_corpus(args.size, args.seed)
+
+    server = None
+    base_url = args.url.rstrip("/")
+    if args.stub:
+        server = start_stub_server()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        results = run_load(base_url, corpus, args.endpoints, args.concurrency, args.requests, args.warmup)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "target": "stub" if args.stub else base_url,
+        "config": {
+            "corpus": args.corpus or f"generated(size={args.size}, seed={args.seed})",
+            "concurrency": args.concurrency,
+            "requests_per_endpoint": args.requests,
+            "warmup": args.warmup
+        },
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": results
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    for endpoint, result in results.items():
+        latency = result["latency_ms"]
+        print(f"{endpoint}: {result['throughput_rps']} req/s, p50 {latency['p50']} ms, "
+              f"p95 {latency['p95']} ms, p99 {latency['p99']} ms, errors {result['errors']}")
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
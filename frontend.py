@@ -7,16 +7,82 @@ import streamlit as st
 import requests
 import json
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Iterator
 import os
-from datetime import datetime
+import re
+import uuid
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import httpx
+except ImportError:  # concurrent page requests are disabled without httpx
+    httpx = None
 
 # Load environment variables
 API_BASE_URL = os.getenv("API_URL", "http://127.0.0.1:8000")
 API_KEY = os.getenv("API_KEY", "MediGuard_Hackathon_2024_SecureKey")
 
+# Static assets (theme CSS, fonts, page fragments) read from ./static; Streamlit's
+# static route only serves the font files, since it sends .css as text/plain
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "static")
+
+# HTTP connection pool settings
+API_POOL_SIZE = int(os.getenv("API_POOL_SIZE", "10"))
+API_MAX_RETRIES = int(os.getenv("API_MAX_RETRIES", "3"))
+API_BACKOFF_FACTOR = float(os.getenv("API_BACKOFF_FACTOR", "0.3"))
+API_CONNECT_TIMEOUT = float(os.getenv("API_CONNECT_TIMEOUT", "3.05"))
+API_READ_TIMEOUT = float(os.getenv("API_READ_TIMEOUT", "30"))
+
+# Result cache settings
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "512"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "3600"))
+RESULT_CACHE_DIR = os.getenv("RESULT_CACHE_DIR", "")
+RESULT_CACHE_SWEEP_INTERVAL = float(os.getenv("RESULT_CACHE_SWEEP_INTERVAL", "300"))
+# The cache is shared by every session, so clearing it from the sidebar is opt-in
+RESULT_CACHE_ALLOW_CLEAR = os.getenv("RESULT_CACHE_ALLOW_CLEAR", "false").lower() == "true"
+
+# Analysis history settings
+HISTORY_DB_PATH = os.getenv("HISTORY_DB_PATH", "analysis_history.db")
+HISTORY_PAGE_SIZE = int(os.getenv("HISTORY_PAGE_SIZE", "20"))
+# Fixed owner (e.g. a clinic id) for deployments without sign-in; also adopts rows
+# recorded before the store had owners
+HISTORY_OWNER = os.getenv("HISTORY_OWNER", "")
+HISTORY_OWNER_PARAM = os.getenv("HISTORY_OWNER_PARAM", "history")
+HISTORY_RETENTION_DAYS = int(os.getenv("HISTORY_RETENTION_DAYS", "90"))  # 0 keeps rows forever
+HISTORY_PRUNE_INTERVAL = float(os.getenv("HISTORY_PRUNE_INTERVAL", "3600"))
+
+# Batch verification settings
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", "100"))
+BATCH_READ_TIMEOUT = float(os.getenv("BATCH_READ_TIMEOUT", "300"))
+
+# Document (OCR) ingestion settings
+OCR_READ_TIMEOUT = float(os.getenv("OCR_READ_TIMEOUT", "120"))
+OCR_UPLOAD_TYPES = ["png", "jpg", "jpeg", "tiff", "tif", "pdf"]
+
+# Concurrent (async) request settings
+API_MAX_IN_FLIGHT_PER_SESSION = int(os.getenv("API_MAX_IN_FLIGHT_PER_SESSION", "4"))
+
+# Backend health probe settings
+HEALTH_CHECK_INTERVAL = float(os.getenv("HEALTH_CHECK_INTERVAL", "10"))
+HEALTH_CACHE_TTL = float(os.getenv("HEALTH_CACHE_TTL", "30"))
+HEALTH_DEGRADED_LATENCY_MS = float(os.getenv("HEALTH_DEGRADED_LATENCY_MS", "1000"))
+HEALTH_FAILURE_THRESHOLD = int(os.getenv("HEALTH_FAILURE_THRESHOLD", "3"))
+HEALTH_PROBE_TIMEOUT = float(os.getenv("HEALTH_PROBE_TIMEOUT", "2"))
+
 # Page configuration
 st.set_page_config(
     page_title="AI Prescription Verifier",
@@ -30,424 +96,729 @@ st.set_page_config(
     }
 )
 
+@st.cache_resource
+def load_static_asset(name: str) -> str:
+    """Read a file from the static directory once per process"""
+    with open(os.path.join(STATIC_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+@st.cache_resource
+def load_theme_style() -> str:
+    """Inline ``<style>`` block for the theme, built once per process"""
+    return f"<style>{load_static_asset('theme.css')}</style>"
+
 # Professional CSS Theme
 def apply_professional_theme():
-    st.markdown("""
-    <style>
-        /* Import professional fonts */
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-        
-        /* Root variables for consistent theming */
-        :root {
-            --primary-color: #2563eb;
-            --secondary-color: #1e40af;
-            --accent-color: #3b82f6;
-            --success-color: #059669;
-            --warning-color: #d97706;
-            --error-color: #dc2626;
-            --background-color: #f8fafc;
-            --surface-color: #ffffff;
-            --text-primary: #1e293b;
-            --text-secondary: #64748b;
-            --border-color: #e2e8f0;
-            --shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        }
-        
-        /* Base styling */
-        .main {
-            background: linear-gradient(135deg, #f8fafc 0%, #e2e8f0 100%);
-            font-family: 'Inter', -apple-system, BlinkMacSystemFont, sans-serif;
-        }
-        
-        /* Header styles */
-        .main-header {
-            font-size: 3.5rem !important;
-            font-weight: 800 !important;
-            background: linear-gradient(135deg, #2563eb 0%, #3b82f6 50%, #1e40af 100%);
-            -webkit-background-clip: text !important;
-            -webkit-text-fill-color: transparent !important;
-            text-align: center;
-            margin: 2rem 0 1rem 0 !important;
-            text-shadow: none !important;
-        }
-        
-        .sub-header {
-            font-size: 1.5rem !important;
-            color: #64748b !important;
-            text-align: center;
-            font-weight: 400 !important;
-            margin-bottom: 3rem !important;
-            line-height: 1.6;
-        }
-        
-        /* Sidebar styling */
-        [data-testid="stSidebar"] {
-            background: linear-gradient(180deg, #1e293b 0%, #334155 100%) !important;
-        }
-        
-        [data-testid="stSidebar"] * {
-            color: #f1f5f9 !important;
-        }
-        
-        [data-testid="stSidebar"] h1, 
-        [data-testid="stSidebar"] h2, 
-        [data-testid="stSidebar"] h3 {
-            color: #60a5fa !important;
-            font-weight: 600 !important;
-        }
-        
-        /* Navigation radio buttons */
-        [data-testid="stSidebar"] .stRadio > div {
-            background: rgba(255, 255, 255, 0.05);
-            border-radius: 12px;
-            padding: 1rem;
-            margin: 1rem 0;
-        }
-        
-        [data-testid="stSidebar"] .stRadio label {
-            background: rgba(59, 130, 246, 0.1) !important;
-            border: 1px solid rgba(59, 130, 246, 0.3) !important;
-            border-radius: 8px !important;
-            padding: 0.75rem 1rem !important;
-            margin: 0.25rem 0 !important;
-            transition: all 0.3s ease !important;
-            cursor: pointer !important;
-            display: block !important;
-            width: 100% !important;
-        }
-        
-        [data-testid="stSidebar"] .stRadio label:hover {
-            background: rgba(59, 130, 246, 0.2) !important;
-            border-color: rgba(59, 130, 246, 0.5) !important;
-            transform: translateX(4px) !important;
-        }
-        
-        /* Sample prescription buttons */
-        [data-testid="stSidebar"] .stButton > button {
-            background: linear-gradient(135deg, #3b82f6 0%, #2563eb 100%) !important;
-            color: white !important;
-            border: none !important;
-            border-radius: 10px !important;
-            padding: 0.7rem 1rem !important;
-            font-weight: 500 !important;
-            font-size: 0.9rem !important;
-            width: 100% !important;
-            margin: 0.3rem 0 !important;
-            transition: all 0.3s ease !important;
-        }
-        
-        [data-testid="stSidebar"] .stButton > button:hover {
-            background: linear-gradient(135deg, #2563eb 0%, #1e40af 100%) !important;
-            transform: translateY(-2px) !important;
-            box-shadow: 0 8px 15px rgba(37, 99, 235, 0.4) !important;
-        }
-        
-        /* Main content buttons */
-        .stButton > button {
-            background: linear-gradient(135deg, #2563eb 0%, #3b82f6 100%) !important;
-            color: white !important;
-            border: 2px solid #ffffff !important;
-            border-radius: 12px !important;
-            padding: 0.8rem 2rem !important;
-            font-weight: 600 !important;
-            font-size: 1.1rem !important;
-            transition: all 0.3s ease !important;
-            box-shadow: 0 4px 15px rgba(37, 99, 235, 0.3) !important;
-            min-height: 50px !important;
-            display: inline-block !important;
-            width: auto !important;
-            text-align: center !important;
-            margin: 0.5rem 0 !important;
-            z-index: 100 !important;
-            position: relative !important;
-            text-shadow: none !important;
-        }
-        
-        .stButton > button:hover {
-            background: linear-gradient(135deg, #1e40af 0%, #2563eb 100%) !important;
-            transform: translateY(-2px) !important;
-            box-shadow: 0 8px 25px rgba(30, 64, 175, 0.5) !important;
-        }
-        
-        /* Form inputs */
-        .stTextArea textarea,
-        .stTextInput input,
-        .stNumberInput input,
-        .stSelectbox select {
-            background-color: white !important;
-            border: 2px solid #e2e8f0 !important;
-            border-radius: 10px !important;
-            padding: 1rem !important;
-            font-size: 1rem !important;
-            color: #000000 !important;
-            font-weight: 500 !important;
-            transition: border-color 0.3s ease !important;
-        }
-        
-        .stTextArea textarea:focus,
-        .stTextInput input:focus,
-        .stNumberInput input:focus,
-        .stSelectbox select:focus {
-            border-color: #3b82f6 !important;
-            box-shadow: 0 0 0 3px rgba(59, 130, 246, 0.1) !important;
-        }
-        
-        /* Ensure buttons inside or near text areas are visible */
-        .stTextArea ~ .stButton > button,
-        .stTextInput ~ .stButton > button {
-            margin-top: 1rem !important;
-            display: block !important;
-            clear: both !important;
-        }
-        
-        /* Ensure text inside text areas is visible */
-        .stTextArea textarea {
-            color: #000000 !important;
-            font-weight: 500 !important;
-        }
-        
-        /* Ensure text inside text inputs is visible */
-        .stTextInput input {
-            color: #000000 !important;
-            font-weight: 500 !important;
-        }
-        
-        /* Cards and containers */
-        .feature-card {
-            background: white;
-            border-radius: 15px;
-            padding: 2rem;
-            box-shadow: 0 10px 25px rgba(0, 0, 0, 0.1);
-            border: 1px solid #f1f5f9;
-            transition: all 0.3s ease;
-            height: 100%;
-            margin-bottom: 1.5rem;
-        }
-        
-        .feature-card:hover {
-            transform: translateY(-5px);
-            box-shadow: 0 20px 40px rgba(0, 0, 0, 0.15);
-            border-color: #3b82f6;
-        }
-        
-        .feature-card h3 {
-            color: #1e293b !important;
-            font-size: 1.5rem !important;
-            font-weight: 700 !important;
-            margin-bottom: 1rem !important;
-            border-bottom: 3px solid #3b82f6;
-            padding-bottom: 0.5rem;
-        }
-        
-        .feature-card ul {
-            color: #64748b !important;
-            line-height: 1.8;
-        }
-        
-        .feature-card li {
-            margin-bottom: 0.5rem;
-            position: relative;
-            padding-left: 1.5rem;
-        }
-        
-        .feature-card li:before {
-            content: "✓";
-            position: absolute;
-            left: 0;
-            color: #059669;
-            font-weight: bold;
-        }
-        
-        /* Hero section */
-        .hero-section {
-            background: linear-gradient(135deg, #3b82f6 0%, #2563eb 50%, #1e40af 100%);
-            color: white !important;
-            padding: 3rem 2rem;
-            border-radius: 20px;
-            margin-bottom: 3rem;
-            text-align: center;
-            box-shadow: 0 20px 40px rgba(59, 130, 246, 0.3);
-        }
-        
-        .hero-section h1 {
-            color: white !important;
-            font-size: 2.5rem !important;
-            font-weight: 800 !important;
-            margin-bottom: 1rem !important;
-        }
-        
-        .hero-section p {
-            color: rgba(255, 255, 255, 0.9) !important;
-            font-size: 1.3rem !important;
-            line-height: 1.6;
-        }
-        
-        /* Alert styles */
-        .stAlert {
-            border-radius: 10px !important;
-            border: none !important;
-            padding: 1rem 1.5rem !important;
-            margin: 1rem 0 !important;
-        }
-        
-        .stSuccess {
-            background: linear-gradient(135deg, #d1fae5, #a7f3d0) !important;
-            color: #065f46 !important;
-            border-left: 4px solid #059669 !important;
-        }
-        
-        .stError {
-            background: linear-gradient(135deg, #fee2e2, #fecaca) !important;
-            color: #991b1b !important;
-            border-left: 4px solid #dc2626 !important;
-        }
-        
-        .stWarning {
-            background: linear-gradient(135deg, #fef3c7, #fde68a) !important;
-            color: #92400e !important;
-            border-left: 4px solid #d97706 !important;
-        }
-        
-        .stInfo {
-            background: linear-gradient(135deg, #dbeafe, #bfdbfe) !important;
-            color: #1e40af !important;
-            border-left: 4px solid #2563eb !important;
-        }
-        
-        /* Expanders */
-        .streamlit-expander {
-            background: white !important;
-            border: 2px solid #f1f5f9 !important;
-            border-radius: 12px !important;
-            margin: 1rem 0 !important;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05) !important;
-        }
-        
-        .streamlit-expander:hover {
-            border-color: #3b82f6 !important;
-            box-shadow: 0 8px 15px rgba(59, 130, 246, 0.1) !important;
-        }
-        
-        .streamlit-expanderHeader {
-            color: #1e293b !important;
-            font-weight: 600 !important;
-            font-size: 1.1rem !important;
-        }
-        
-        .streamlit-expanderContent {
-            color: #64748b !important;
-            padding: 1.5rem !important;
-        }
-        
-        /* Tables */
-        table {
-            background: white !important;
-            border-radius: 12px !important;
-            overflow: hidden !important;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05) !important;
-        }
-        
-        th {
-            background: linear-gradient(135deg, #3b82f6, #2563eb) !important;
-            color: white !important;
-            font-weight: 600 !important;
-            padding: 1rem !important;
-            text-transform: uppercase !important;
-            font-size: 0.9rem !important;
-            letter-spacing: 0.5px !important;
-        }
-        
-        td {
-            color: #1e293b !important;
-            padding: 1rem !important;
-            border-bottom: 1px solid #f1f5f9 !important;
-        }
-        
-        tr:hover {
-            background: #f8fafc !important;
-        }
-        
-        /* Metrics */
-        .metric-card {
-            background: white;
-            border-radius: 12px;
-            padding: 1.5rem;
-            text-align: center;
-            box-shadow: 0 4px 6px rgba(0, 0, 0, 0.05);
-            border: 1px solid #f1f5f9;
-            transition: all 0.3s ease;
-        }
-        
-        .metric-card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 8px 15px rgba(0, 0, 0, 0.1);
-        }
-        
-        /* Ensure all text is properly colored and visible */
-        .main h1, .main h2, .main h3, .main h4, .main h5, .main h6 {
-            color: #1e293b !important;
-            font-weight: 600 !important;
-        }
-        
-        .main p, .main div, .main span {
-            color: #1e293b !important;
-        }
-        
-        /* Fix column layout for buttons */
-        .row-widget.stButton {
-            width: 100% !important;
-            display: block !important;
-            margin: 0.5rem 0 !important;
-        }
-        
-        /* Improve placeholder text visibility */
-        ::placeholder {
-            color: #475569 !important;
-            opacity: 1 !important;
-        }
-        
-        /* Ensure buttons in columns are visible */
-        [data-testid="column"] .stButton > button {
-            width: 100% !important;
-            display: block !important;
-            margin: 0.5rem 0 !important;
-            z-index: 10 !important;
-        }
-        
-        /* Loading spinner */
-        .stSpinner > div {
-            border-top-color: #3b82f6 !important;
-        }
+    # Inlined rather than linked: Streamlit serves static .css as text/plain with
+    # nosniff, so browsers would refuse a <link> to it
+    st.markdown(load_theme_style(), unsafe_allow_html=True)
+
+# Apply the theme
+apply_professional_theme()
+
+class APIClient:
+    """Pooled keep-alive HTTP client for the FastAPI backend"""
+    
+    def __init__(self, base_url: str = API_BASE_URL, pool_size: int = API_POOL_SIZE,
+                 max_retries: int = API_MAX_RETRIES, backoff_factor: float = API_BACKOFF_FACTOR,
+                 connect_timeout: float = API_CONNECT_TIMEOUT, read_timeout: float = API_READ_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        
+        # Only retry failures where the backend never started the work: connection errors
+        # and 503. Read timeouts are not retried, so a slow analysis is not re-queued as
+        # extra model passes on an already loaded backend.
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=0,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(503,),
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
         
-        /* Scrollbar */
-        ::-webkit-scrollbar {
-            width: 8px;
-            height: 8px;
-        }
+        self.session = requests.Session()
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
         
-        ::-webkit-scrollbar-track {
-            background: #f1f5f9;
-            border-radius: 4px;
+        self._lock = threading.Lock()
+        self._requests_sent = 0
+        self._errors = 0
+        self._unsupported_routes = set()
+    
+    def request(self, method: str, path: str, read_timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """Send a request over the shared session using split connect/read timeouts"""
+        timeout = (self.connect_timeout, read_timeout if read_timeout is not None else self.read_timeout)
+        with self._lock:
+            self._requests_sent += 1
+        try:
+            return self.session.request(method, f"{self.base_url}{path}", timeout=timeout, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self._errors += 1
+            raise
+    
+    def supports(self, path: str) -> bool:
+        """False once ``path`` has answered 404/405, so optional routes are probed only once"""
+        return path not in self._unsupported_routes
+    
+    def mark_unsupported(self, path: str):
+        with self._lock:
+            self._unsupported_routes.add(path)
+    
+    def get(self, path: str, **kwargs) -> requests.Response:
+        return self.request("GET", path, **kwargs)
+    
+    def post(self, path: str, **kwargs) -> requests.Response:
+        return self.request("POST", path, **kwargs)
+    
+    def pool_stats(self) -> Dict[str, Any]:
+        """Report connection reuse across all host pools"""
+        stats = {
+            "pool_size": self.pool_size,
+            "requests_sent": self._requests_sent,
+            "errors": self._errors,
+            "unsupported_routes": sorted(self._unsupported_routes),
+            "hosts": 0,
+            "connections_opened": 0,
+            "idle_connections": 0
         }
-        
-        ::-webkit-scrollbar-thumb {
-            background: #cbd5e1;
-            border-radius: 4px;
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            stats["hosts"] += 1
+            stats["connections_opened"] += pool.num_connections
+            stats["idle_connections"] += pool.pool.qsize() if pool.pool is not None else 0
+        if stats["requests_sent"]:
+            stats["connection_reuse"] = round(1 - stats["connections_opened"] / stats["requests_sent"], 3)
+        else:
+            stats["connection_reuse"] = 0.0
+        return stats
+
+@st.cache_resource
+def get_api_client() -> APIClient:
+    """Process-wide API client shared by every session and rerun"""
+    return APIClient()
+
+class AsyncAPIClient:
+    """httpx.AsyncClient on a dedicated event-loop thread for concurrent page requests
+    
+    Streamlit scripts run synchronously, so requests are submitted to the loop and
+    come back as concurrent futures. Cancelling a future cancels its task, which
+    closes the underlying connection so the backend stops working on it.
+    """
+    
+    def __init__(self, base_url: str = API_BASE_URL, pool_size: int = API_POOL_SIZE,
+                 max_in_flight: int = API_MAX_IN_FLIGHT_PER_SESSION,
+                 connect_timeout: float = API_CONNECT_TIMEOUT, read_timeout: float = API_READ_TIMEOUT):
+        self.max_in_flight = max_in_flight
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="async-api-client", daemon=True)
+        self._thread.start()
+        
+        self.client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            limits=httpx.Limits(max_connections=pool_size, max_keepalive_connections=pool_size),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout)
+        )
+        # Per-session caps; entries disappear once a session has nothing in flight
+        self._semaphores: "weakref.WeakValueDictionary[str, asyncio.Semaphore]" = weakref.WeakValueDictionary()
+    
+    async def _post(self, session_id: str, path: str, payload: Dict[str, Any], headers: Dict[str, str]) -> Dict[str, Any]:
+        semaphore = self._semaphores.get(session_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_in_flight)
+            self._semaphores[session_id] = semaphore
+        
+        # Same contract as the sync client: failures come back as results, never raise
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                response = await self.client.post(path, json=payload, headers=headers)
+                latency_ms = round((time.perf_counter() - started) * 1000, 1)
+                
+                if response.status_code == 200:
+                    return {"success": True, "data": response.json(), "latency_ms": latency_ms}
+                return {"success": False, "error": f"API Error {response.status_code}: {response.text}", "status_code": response.status_code}
+            except Exception as e:
+                return {"success": False, "error": f"Connection Error: {str(e)}"}
+    
+    def submit_post(self, session_id: str, path: str, payload: Dict[str, Any], headers: Dict[str, str]) -> Future:
+        """Schedule a POST on the event loop and return a cancellable future"""
+        return asyncio.run_coroutine_threadsafe(self._post(session_id, path, payload, headers), self.loop)
+
+@st.cache_resource
+def get_async_api_client() -> Optional[AsyncAPIClient]:
+    """Process-wide async client, or None when httpx is not installed"""
+    return AsyncAPIClient() if httpx is not None else None
+
+def await_requests(futures: Dict[str, Future], status=None, poll_interval: float = 0.1) -> Dict[str, Dict[str, Any]]:
+    """Wait for submitted requests while letting Streamlit interrupt the run
+    
+    When the page passes a ``status`` placeholder, an elapsed-time caption is
+    refreshed in it while waiting; if the user reruns the page, Streamlit raises out
+    of that update. Either way the finally block cancels whatever is still in flight.
+    """
+    started = time.perf_counter()
+    try:
+        pending = set(futures.values())
+        while pending:
+            _, pending = wait(pending, timeout=poll_interval)
+            if pending and status is not None:
+                status.caption(f"⏳ Waiting for backend... {time.perf_counter() - started:.1f}s")
+        return {name: future.result() for name, future in futures.items()}
+    finally:
+        if status is not None:
+            status.empty()
+        for future in futures.values():
+            future.cancel()
+
+class HealthMonitor:
+    """Background /health probe with cached circuit-breaker state"""
+    
+    HEALTHY = "healthy"
+    DEGRADED = "degraded"
+    DOWN = "down"
+    UNKNOWN = "unknown"
+    
+    def __init__(self, base_url: str = API_BASE_URL, interval: float = HEALTH_CHECK_INTERVAL, ttl: float = HEALTH_CACHE_TTL,
+                 degraded_latency_ms: float = HEALTH_DEGRADED_LATENCY_MS, failure_threshold: int = HEALTH_FAILURE_THRESHOLD,
+                 probe_timeout: float = HEALTH_PROBE_TIMEOUT):
+        self.health_url = f"{base_url.rstrip('/')}/health"
+        self.probe_timeout = probe_timeout
+        # Dedicated retry-free session: one probe is one short request, and it stays
+        # out of the shared pool's counters
+        self.session = requests.Session()
+        self.interval = interval
+        self.ttl = ttl
+        self.degraded_latency_ms = degraded_latency_ms
+        self.failure_threshold = failure_threshold
+        
+        self._lock = threading.Lock()
+        self._status = {
+            "state": self.UNKNOWN,
+            "latency_ms": None,
+            "checked_at": None,
+            "consecutive_failures": 0,
+            "ready": None,
+            "error": None
         }
-        
-        ::-webkit-scrollbar-thumb:hover {
-            background: #94a3b8;
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="health-monitor", daemon=True)
+        self._thread.start()
+    
+    def _probe(self):
+        """Run one health check and update the breaker state"""
+        started = time.perf_counter()
+        error = None
+        ready = None
+        try:
+            response = self.session.get(self.health_url, timeout=self.probe_timeout)
+            ok = response.status_code == 200
+            if ok:
+                # Backends that load models lazily report readiness alongside liveness
+                try:
+                    body = response.json()
+                    ready = body.get("ready") if isinstance(body, dict) else None
+                except ValueError:
+                    pass
+            else:
+                error = f"HTTP {response.status_code}"
+        except Exception as e:
+            ok = False
+            error = str(e)
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+        
+        with self._lock:
+            failures = 0 if ok else self._status["consecutive_failures"] + 1
+            if ok and ready is False:
+                state = self.DEGRADED
+            elif ok:
+                state = self.HEALTHY if latency_ms < self.degraded_latency_ms else self.DEGRADED
+            elif failures >= self.failure_threshold:
+                state = self.DOWN
+            else:
+                state = self.DEGRADED
+            self._status = {
+                "state": state,
+                "latency_ms": latency_ms,
+                "checked_at": time.time(),
+                "consecutive_failures": failures,
+                "ready": ready,
+                "error": error
+            }
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self._probe()
+            # Back off while the circuit is open so a dead backend is not hammered
+            wait = self.interval * 3 if self._status["state"] == self.DOWN else self.interval
+            self._stop.wait(wait)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Return the cached status without touching the network"""
+        with self._lock:
+            status = dict(self._status)
+        if status["checked_at"] is not None and time.time() - status["checked_at"] > self.ttl:
+            status["state"] = self.UNKNOWN
+        return status
+    
+    def stop(self):
+        self._stop.set()
+
+@st.cache_resource
+def get_health_monitor() -> HealthMonitor:
+    """Process-wide health monitor shared by every session"""
+    return HealthMonitor()
+
+class ResultCache:
+    """LRU/TTL cache of analysis results keyed by normalized prescription text"""
+    
+    ENTRY_FILE_PATTERN = re.compile(r"[0-9a-f]{64}\.json(\.tmp)?")
+    
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl: float = RESULT_CACHE_TTL,
+                 cache_dir: Optional[str] = RESULT_CACHE_DIR or None,
+                 sweep_interval: float = RESULT_CACHE_SWEEP_INTERVAL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.cache_dir = cache_dir
+        self.sweep_interval = sweep_interval
+        self._next_sweep = 0.0
+        
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self.sweep()
+    
+    @staticmethod
+    def make_key(endpoint: str, prescription_text: str, patient_age: Optional[int] = None) -> str:
+        """Content address for an analysis request"""
+        normalized = re.sub(r"\s+", " ", prescription_text).strip().lower()
+        raw = json.dumps([endpoint, normalized, patient_age])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+    
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[0] <= self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+        
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), "r", encoding="utf-8") as f:
+                    stored = json.load(f)
+                if now - stored["stored_at"] <= self.ttl:
+                    self._store(key, stored["data"], stored["stored_at"])
+                    with self._lock:
+                        self.hits += 1
+                    return stored["data"]
+                os.remove(self._disk_path(key))
+            except (OSError, ValueError, KeyError):
+                pass
+        
+        with self._lock:
+            self.misses += 1
+        return None
+    
+    def _store(self, key: str, data: Dict[str, Any], stored_at: float):
+        evicted = []
+        with self._lock:
+            self._entries[key] = (stored_at, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+                self.evictions += 1
+        
+        # Evicted entries leave the disk tier too, so it stays bounded by max_entries
+        if self.cache_dir:
+            for evicted_key in evicted:
+                try:
+                    os.remove(self._disk_path(evicted_key))
+                except OSError:
+                    pass
+    
+    def sweep(self):
+        """Delete entry files older than the TTL (including abandoned temp files)"""
+        self._next_sweep = time.monotonic() + self.sweep_interval
+        cutoff = time.time() - self.ttl
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not self.ENTRY_FILE_PATTERN.fullmatch(name):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+            except OSError:
+                pass
+    
+    def put(self, key: str, data: Dict[str, Any]):
+        stored_at = time.time()
+        self._store(key, data, stored_at)
+        if self.cache_dir:
+            if time.monotonic() >= self._next_sweep:
+                self.sweep()
+            try:
+                tmp_path = self._disk_path(key) + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump({"stored_at": stored_at, "data": data}, f)
+                os.replace(tmp_path, self._disk_path(key))
+            except OSError:
+                pass
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.cache_dir:
+            # Only remove entries this cache wrote; the directory may be shared
+            for name in os.listdir(self.cache_dir):
+                if self.ENTRY_FILE_PATTERN.fullmatch(name):
+                    try:
+                        os.remove(os.path.join(self.cache_dir, name))
+                    except OSError:
+                        pass
+    
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "persistent": bool(self.cache_dir)
         }
-    </style>
-    """, unsafe_allow_html=True)
 
-# Apply the theme
-apply_professional_theme()
+@st.cache_resource
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache shared by every session"""
+    return ResultCache()
+
+class HistoryStore:
+    """SQLite-backed analysis history with indexes on timestamp, type and drug
+    
+    The store is shared by every Streamlit session, so each row carries the owner
+    that recorded it and history queries and ``clear()`` are scoped to one owner.
+    The analytics queries (rollups, latencies) hold no prescription text and
+    aggregate across owners unless one is given. Rows older than
+    ``retention_days`` are pruned for every owner.
+    """
+    
+    def __init__(self, db_path: str = HISTORY_DB_PATH, legacy_owner: Optional[str] = None,
+                 retention_days: int = HISTORY_RETENTION_DAYS, prune_interval: float = HISTORY_PRUNE_INTERVAL):
+        self.db_path = db_path
+        self.retention_days = retention_days
+        self.prune_interval = prune_interval
+        self._next_prune = 0.0
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS analyses (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    type TEXT NOT NULL,
+                    prescription TEXT NOT NULL,
+                    results TEXT
+                );
+                CREATE TABLE IF NOT EXISTS analysis_drugs (
+                    analysis_id INTEGER NOT NULL REFERENCES analyses(id) ON DELETE CASCADE,
+                    drug TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_analyses_timestamp ON analyses(timestamp);
+                CREATE INDEX IF NOT EXISTS idx_analyses_type ON analyses(type, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_analysis_drugs_drug ON analysis_drugs(drug, analysis_id);
+            """)
+            
+            # Columns added after the first release of the store
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(analyses)")}
+            for column, declaration in (("patient_age", "INTEGER"), ("age_group", "TEXT"), ("latency_ms", "REAL"),
+                                        ("owner", "TEXT")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE analyses ADD COLUMN {column} {declaration}")
+            
+            # Rollups without an owner can't be scoped; they are rebuilt below for
+            # legacy rows that get adopted, and the rest age out with retention
+            rollup_columns = {row["name"] for row in conn.execute("PRAGMA table_info(interaction_rollup)")}
+            if rollup_columns and "owner" not in rollup_columns:
+                conn.execute("DROP TABLE interaction_rollup")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS interaction_rollup (
+                    owner TEXT NOT NULL,
+                    day TEXT NOT NULL,
+                    drug_a TEXT NOT NULL,
+                    drug_b TEXT NOT NULL,
+                    severity TEXT NOT NULL,
+                    age_group TEXT NOT NULL,
+                    count INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (owner, day, drug_a, drug_b, severity, age_group)
+                );
+                CREATE INDEX IF NOT EXISTS idx_analyses_owner ON analyses(owner, timestamp);
+                CREATE INDEX IF NOT EXISTS idx_interaction_rollup_day ON interaction_rollup(day);
+            """)
+            
+            if legacy_owner:
+                self._adopt_legacy_rows(conn, legacy_owner)
+        self.prune()
+    
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        # One short-lived connection per operation keeps the store safe across Streamlit threads
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+    
+    @staticmethod
+    def age_group(patient_age: Optional[int]) -> str:
+        """Age bands used by the dosage checker"""
+        if patient_age is None:
+            return "unknown"
+        if patient_age < 12:
+            return "pediatric"
+        if patient_age >= 65:
+            return "geriatric"
+        return "adult"
+    
+    @staticmethod
+    def _rollup_rows(owner: str, results: Dict[str, Any], timestamp: str, age_group: str) -> List[tuple]:
+        rows = []
+        for interaction in results.get("interactions", []):
+            # Order each pair so A+B and B+A aggregate together
+            drug_a, drug_b = sorted((
+                str(interaction.get("drug_a", "unknown")).strip().lower(),
+                str(interaction.get("drug_b", "unknown")).strip().lower()
+            ))
+            severity = str(interaction.get("severity", "UNKNOWN")).upper()
+            rows.append((owner, timestamp[:10], drug_a, drug_b, severity, age_group))
+        return rows
+    
+    @staticmethod
+    def _add_rollups(conn: sqlite3.Connection, rows: List[tuple]):
+        conn.executemany(
+            "INSERT INTO interaction_rollup (owner, day, drug_a, drug_b, severity, age_group, count) "
+            "VALUES (?, ?, ?, ?, ?, ?, 1) "
+            "ON CONFLICT (owner, day, drug_a, drug_b, severity, age_group) DO UPDATE SET count = count + 1",
+            rows
+        )
+    
+    def _adopt_legacy_rows(self, conn: sqlite3.Connection, owner: str):
+        """Give rows recorded before owners existed to the configured owner"""
+        rows = conn.execute("SELECT id, timestamp, results, age_group FROM analyses WHERE owner IS NULL").fetchall()
+        for row in rows:
+            try:
+                results = json.loads(row["results"]) if row["results"] else {}
+            except ValueError:
+                results = {}
+            self._add_rollups(conn, self._rollup_rows(owner, results, row["timestamp"], row["age_group"] or "unknown"))
+        conn.execute("UPDATE analyses SET owner = ? WHERE owner IS NULL", (owner,))
+    
+    def prune(self):
+        """Delete analyses and rollups older than the retention period, for every owner
+        
+        This also removes rows nobody can reach any more, e.g. legacy rows without
+        an owner or rows from owners that no longer exist.
+        """
+        if self.retention_days <= 0:
+            return
+        self._next_prune = time.monotonic() + self.prune_interval
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM analysis_drugs WHERE analysis_id IN (SELECT id FROM analyses WHERE timestamp < ?)", (cutoff,)
+            )
+            conn.execute("DELETE FROM analyses WHERE timestamp < ?", (cutoff,))
+            conn.execute("DELETE FROM interaction_rollup WHERE day < ?", (cutoff,))
+    
+    def add(self, owner: str, prescription: str, analysis_type: str, results: Dict[str, Any], timestamp: str,
+            patient_age: Optional[int] = None, latency_ms: Optional[float] = None) -> int:
+        """Store an analysis, index its extracted medicines and update the rollups"""
+        if time.monotonic() >= self._next_prune:
+            self.prune()
+        
+        drugs = {str(med).strip().lower() for med in results.get("extracted_medicines", []) if str(med).strip()}
+        age_group = self.age_group(patient_age)
+        rollup_rows = self._rollup_rows(owner, results, timestamp, age_group)
+        
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO analyses (owner, timestamp, type, prescription, results, patient_age, age_group, latency_ms) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (owner, timestamp, analysis_type, prescription, json.dumps(results), patient_age, age_group, latency_ms)
+            )
+            analysis_id = cursor.lastrowid
+            conn.executemany(
+                "INSERT INTO analysis_drugs (analysis_id, drug) VALUES (?, ?)",
+                [(analysis_id, drug) for drug in sorted(drugs)]
+            )
+            self._add_rollups(conn, rollup_rows)
+        return analysis_id
+    
+    @staticmethod
+    def _where(owner: str, analysis_type: Optional[str], drug: Optional[str]) -> tuple:
+        clauses, params = ["owner = ?"], [owner]
+        if analysis_type:
+            clauses.append("type = ?")
+            params.append(analysis_type)
+        if drug:
+            clauses.append("id IN (SELECT analysis_id FROM analysis_drugs WHERE drug = ?)")
+            params.append(drug.strip().lower())
+        return " WHERE " + " AND ".join(clauses), params
+    
+    def count(self, owner: str, analysis_type: Optional[str] = None, drug: Optional[str] = None) -> int:
+        where, params = self._where(owner, analysis_type, drug)
+        with self._connect() as conn:
+            return conn.execute(f"SELECT COUNT(*) FROM analyses{where}", params).fetchone()[0]
+    
+    def list_page(self, owner: str, offset: int, limit: int, analysis_type: Optional[str] = None,
+                  drug: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Newest-first page of analyses without their result bodies"""
+        where, params = self._where(owner, analysis_type, drug)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT id, timestamp, type, prescription FROM analyses{where} "
+                "ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [dict(row) for row in rows]
+    
+    def get_results(self, owner: str, analysis_id: int) -> Optional[Dict[str, Any]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT results FROM analyses WHERE id = ? AND owner = ?", (analysis_id, owner)
+            ).fetchone()
+        return json.loads(row["results"]) if row and row["results"] else None
+    
+    def types(self, owner: str) -> List[str]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute(
+                "SELECT DISTINCT type FROM analyses WHERE owner = ? ORDER BY type", (owner,)
+            )]
+    
+    def interaction_rollup(self, start_day: str, end_day: str, drug: Optional[str] = None,
+                           severity: Optional[str] = None, age_group: Optional[str] = None,
+                           owner: Optional[str] = None) -> pd.DataFrame:
+        """Pre-aggregated interaction counts for the analytics dashboard"""
+        clauses, params = ["day BETWEEN ? AND ?"], [start_day, end_day]
+        if owner is not None:
+            clauses.append("owner = ?")
+            params.append(owner)
+        if drug:
+            clauses.append("(drug_a = ? OR drug_b = ?)")
+            params += [drug.strip().lower()] * 2
+        if severity:
+            clauses.append("severity = ?")
+            params.append(severity)
+        if age_group:
+            clauses.append("age_group = ?")
+            params.append(age_group)
+        with self._connect() as conn:
+            return pd.read_sql_query(
+                "SELECT day, drug_a, drug_b, severity, age_group, SUM(count) AS count FROM interaction_rollup WHERE "
+                + " AND ".join(clauses)
+                + " GROUP BY day, drug_a, drug_b, severity, age_group",
+                conn,
+                params=params
+            )
+    
+    def latencies(self, start_day: str, end_day: str, drug: Optional[str] = None,
+                  age_group: Optional[str] = None, owner: Optional[str] = None) -> np.ndarray:
+        """Recorded client latencies (ms) for the analytics dashboard"""
+        clauses = ["timestamp >= ?", "timestamp < date(?, '+1 day')", "latency_ms IS NOT NULL"]
+        params: List[Any] = [start_day, end_day]
+        if owner is not None:
+            clauses.append("owner = ?")
+            params.append(owner)
+        if drug:
+            clauses.append("id IN (SELECT analysis_id FROM analysis_drugs WHERE drug = ?)")
+            params.append(drug.strip().lower())
+        if age_group:
+            clauses.append("age_group = ?")
+            params.append(age_group)
+        with self._connect() as conn:
+            rows = conn.execute("SELECT latency_ms FROM analyses WHERE " + " AND ".join(clauses), params).fetchall()
+        return np.fromiter((row[0] for row in rows), dtype=float, count=len(rows))
+    
+    def severities(self) -> List[str]:
+        with self._connect() as conn:
+            return [row[0] for row in conn.execute("SELECT DISTINCT severity FROM interaction_rollup ORDER BY severity")]
+    
+    def clear(self, owner: str):
+        """Delete one owner's analyses and rollups, leaving other sessions' history alone"""
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM analysis_drugs WHERE analysis_id IN (SELECT id FROM analyses WHERE owner = ?)", (owner,)
+            )
+            conn.execute("DELETE FROM interaction_rollup WHERE owner = ?", (owner,))
+            conn.execute("DELETE FROM analyses WHERE owner = ?", (owner,))
+
+@st.cache_resource
+def get_history_store() -> HistoryStore:
+    """Process-wide analysis history store"""
+    return HistoryStore(legacy_owner=HISTORY_OWNER or None)
+
+def resolve_history_owner() -> str:
+    """Stable identity that owns this visitor's history rows
+    
+    In order of preference: the signed-in user (Streamlit authentication), the
+    configured ``HISTORY_OWNER`` (e.g. one clinic per deployment), or a persistent
+    token kept in the page URL so reloads and bookmarks reopen the same history.
+    """
+    try:
+        user = st.user
+        if user.get("is_logged_in") and user.get("email"):
+            return f"user:{user.get('email')}"
+    except Exception:
+        pass  # authentication not configured
+    
+    if HISTORY_OWNER:
+        return f"config:{HISTORY_OWNER}"
+    
+    token = st.query_params.get(HISTORY_OWNER_PARAM)
+    if not token or not re.fullmatch(r"[0-9a-f]{32}", token):
+        token = uuid.uuid4().hex
+        st.query_params[HISTORY_OWNER_PARAM] = token
+    return f"token:{token}"
 
 class PrescriptionVerifierApp:
     """Main application class for Streamlit interface"""
     
     def __init__(self):
+        self.client = get_api_client()
+        self.health_monitor = get_health_monitor()
+        self.result_cache = get_result_cache()
+        self.history = get_history_store()
+        self.async_client = get_async_api_client()
+        if 'client_session_id' not in st.session_state:
+            st.session_state.client_session_id = uuid.uuid4().hex
+        self.history_owner = resolve_history_owner()
         self.api_headers = {
             "x-api-key": API_KEY,
             "Content-Type": "application/json"
@@ -456,31 +827,33 @@ class PrescriptionVerifierApp:
         # Initialize session state
         if 'prescription_text' not in st.session_state:
             st.session_state.prescription_text = ""
-        if 'analysis_history' not in st.session_state:
-            st.session_state.analysis_history = []
     
-    def check_api_connection(self) -> bool:
-        """Check if FastAPI backend is accessible"""
-        try:
-            response = requests.get(f"{API_BASE_URL}/health", timeout=5)
-            return response.status_code == 200
-        except:
-            return False
+    def get_health_status(self) -> Dict[str, Any]:
+        """Cached backend health from the background monitor"""
+        return self.health_monitor.get_status()
     
     def call_interaction_endpoint(self, prescription_text: str) -> Dict[str, Any]:
         """Call the /check_interactions endpoint"""
+        cache_key = self.result_cache.make_key("check_interactions", prescription_text)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return {"success": True, "data": cached, "cached": True}
+        
         try:
             payload = {"prescription_text": prescription_text}
             
-            response = requests.post(
-                f"{API_BASE_URL}/check_interactions",
+            started = time.perf_counter()
+            response = self.client.post(
+                "/check_interactions",
                 headers=self.api_headers,
-                json=payload,
-                timeout=30
+                json=payload
             )
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                data = response.json()
+                self.result_cache.put(cache_key, data)
+                return {"success": True, "data": data, "latency_ms": latency_ms}
             else:
                 return {"success": False, "error": f"API Error {response.status_code}: {response.text}"}
                 
@@ -489,26 +862,406 @@ class PrescriptionVerifierApp:
     
     def call_dosage_endpoint(self, prescription_text: str, patient_age: Optional[int] = None) -> Dict[str, Any]:
         """Call the /check_dosage endpoint"""
+        cache_key = self.result_cache.make_key("check_dosage", prescription_text, patient_age)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return {"success": True, "data": cached, "cached": True}
+        
+        try:
+            payload = {
+                "prescription_text": prescription_text,
+                "patient_age": patient_age
+            }
+            
+            started = time.perf_counter()
+            response = self.client.post(
+                "/check_dosage",
+                headers=self.api_headers,
+                json=payload
+            )
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
+            
+            if response.status_code == 200:
+                data = response.json()
+                self.result_cache.put(cache_key, data)
+                return {"success": True, "data": data, "latency_ms": latency_ms}
+            else:
+                return {"success": False, "error": f"API Error {response.status_code}: {response.text}"}
+                
+        except Exception as e:
+            return {"success": False, "error": f"Connection Error: {str(e)}"}
+    
+    def verify(self, prescription_text: str, patient_age: Optional[int] = None, status=None) -> Dict[str, Any]:
+        """Call the combined /verify endpoint (interactions + dosage in one round trip)
+        
+        ``status`` is an optional placeholder from the page for the wait caption shown
+        when falling back to concurrent separate calls.
+        """
+        cache_key = self.result_cache.make_key("verify", prescription_text, patient_age)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return {"success": True, "data": cached, "cached": True}
+        
+        if not self.client.supports("/verify"):
+            return self._verify_separately(prescription_text, patient_age, status)
+        
         try:
             payload = {
                 "prescription_text": prescription_text,
                 "patient_age": patient_age
             }
             
-            response = requests.post(
-                f"{API_BASE_URL}/check_dosage",
+            started = time.perf_counter()
+            response = self.client.post(
+                "/verify",
                 headers=self.api_headers,
-                json=payload,
-                timeout=30
+                json=payload
             )
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
             
             if response.status_code == 200:
-                return {"success": True, "data": response.json()}
+                data = response.json()
+                self.result_cache.put(cache_key, data)
+                return {"success": True, "data": data, "latency_ms": latency_ms}
+            elif response.status_code in (404, 405):
+                # Older backends without /verify: fall back to the two separate endpoints
+                self.client.mark_unsupported("/verify")
+                return self._verify_separately(prescription_text, patient_age, status)
             else:
                 return {"success": False, "error": f"API Error {response.status_code}: {response.text}"}
                 
         except Exception as e:
             return {"success": False, "error": f"Connection Error: {str(e)}"}
+    
+    def _verify_separately(self, prescription_text: str, patient_age: Optional[int] = None,
+                           status=None) -> Dict[str, Any]:
+        """Build a /verify-shaped payload from /check_interactions and /check_dosage"""
+        if self.async_client is None:
+            interaction_result = self.call_interaction_endpoint(prescription_text)
+            if not interaction_result["success"]:
+                return interaction_result
+            dosage_result = self.call_dosage_endpoint(prescription_text, patient_age)
+            if not dosage_result["success"]:
+                return dosage_result
+            latencies = [r.get("latency_ms") for r in (interaction_result, dosage_result) if r.get("latency_ms") is not None]
+            return {
+                "success": True,
+                "data": {**interaction_result["data"], **dosage_result["data"]},
+                "cached": not latencies,
+                "latency_ms": round(sum(latencies), 1) if latencies else None
+            }
+        
+        # The two endpoints are independent, so issue them concurrently
+        started = time.perf_counter()
+        results = self.call_endpoints_concurrently({
+            "check_interactions": {"prescription_text": prescription_text},
+            "check_dosage": {"prescription_text": prescription_text, "patient_age": patient_age}
+        }, patient_age, status)
+        for result in results.values():
+            if not result["success"]:
+                return result
+        all_cached = all(result.get("cached") for result in results.values())
+        return {
+            "success": True,
+            "data": {**results["check_interactions"]["data"], **results["check_dosage"]["data"]},
+            "cached": all_cached,
+            "latency_ms": None if all_cached else round((time.perf_counter() - started) * 1000, 1)
+        }
+    
+    def call_endpoints_concurrently(self, calls: Dict[str, Dict[str, Any]], patient_age: Optional[int] = None,
+                                    status=None) -> Dict[str, Dict[str, Any]]:
+        """POST to several endpoints at once, keyed by endpoint name
+        
+        Cached results are served directly. Requests still in flight when the run is
+        interrupted are cancelled by ``await_requests`` so they stop tying up backend
+        workers.
+        """
+        results, futures, cache_keys = {}, {}, {}
+        for endpoint, payload in calls.items():
+            cache_age = patient_age if endpoint != "check_interactions" else None
+            cache_keys[endpoint] = self.result_cache.make_key(endpoint, payload["prescription_text"], cache_age)
+            cached = self.result_cache.get(cache_keys[endpoint])
+            if cached is not None:
+                results[endpoint] = {"success": True, "data": cached, "cached": True}
+            else:
+                futures[endpoint] = self.async_client.submit_post(
+                    st.session_state.client_session_id, f"/{endpoint}", payload, self.api_headers
+                )
+        
+        results.update(await_requests(futures, status))
+        
+        for endpoint in futures:
+            if results[endpoint]["success"]:
+                self.result_cache.put(cache_keys[endpoint], results[endpoint]["data"])
+        return results
+    
+    def verify_batch(self, prescriptions: List[Dict[str, Any]], chunk_size: int = BATCH_CHUNK_SIZE) -> Iterator[Dict[str, Any]]:
+        """Stream per-item results from the /verify_batch endpoint
+        
+        Each item is a dict with ``prescription_text`` and optional ``patient_age``.
+        Results are yielded in input order as ``{"index", "success", "data"|"error"}``.
+        """
+        for start in range(0, len(prescriptions), chunk_size):
+            chunk = prescriptions[start:start + chunk_size]
+            payload = {
+                "prescriptions": [
+                    {"prescription_text": item.get("prescription_text", ""), "patient_age": item.get("patient_age")}
+                    for item in chunk
+                ]
+            }
+            
+            if not self.client.supports("/verify_batch"):
+                # Backend without batch support: verify one by one over the pooled session
+                for offset, item in enumerate(chunk):
+                    result = self.verify(item.get("prescription_text", ""), item.get("patient_age"))
+                    yield {"index": start + offset, **result}
+                continue
+            
+            try:
+                response = self.client.post(
+                    "/verify_batch",
+                    headers={**self.api_headers, "Accept": "application/x-ndjson"},
+                    json=payload,
+                    stream=True,
+                    read_timeout=BATCH_READ_TIMEOUT
+                )
+            except Exception as e:
+                for offset in range(len(chunk)):
+                    yield {"index": start + offset, "success": False, "error": f"Connection Error: {str(e)}"}
+                continue
+            
+            if response.status_code in (404, 405):
+                # Backend without batch support: verify one by one over the pooled session
+                response.close()
+                self.client.mark_unsupported("/verify_batch")
+                for offset, item in enumerate(chunk):
+                    result = self.verify(item.get("prescription_text", ""), item.get("patient_age"))
+                    yield {"index": start + offset, **result}
+                continue
+            
+            if response.status_code != 200:
+                error = f"API Error {response.status_code}: {response.text}"
+                for offset in range(len(chunk)):
+                    yield {"index": start + offset, "success": False, "error": error}
+                continue
+            
+            received = set()
+            malformed = 0
+            stream_error = None
+            try:
+                with response:
+                    for line in response.iter_lines():
+                        if not line:
+                            continue
+                        try:
+                            item = json.loads(line)
+                            offset = int(item["index"])
+                        except (ValueError, TypeError, KeyError):
+                            malformed += 1
+                            continue
+                        if not 0 <= offset < len(chunk) or offset in received:
+                            malformed += 1
+                            continue
+                        received.add(offset)
+                        if "error" in item:
+                            yield {"index": start + offset, "success": False, "error": item["error"]}
+                        else:
+                            yield {"index": start + offset, "success": True, "data": item.get("result", {})}
+            except requests.RequestException as e:
+                stream_error = f"Stream interrupted: {str(e)}"
+            
+            # Every prescription gets a row, even when the backend never answered for it
+            if stream_error is None:
+                stream_error = "No result returned for this prescription"
+                if malformed:
+                    stream_error += f" ({malformed} malformed response line(s) in this chunk)"
+            for offset in range(len(chunk)):
+                if offset not in received:
+                    yield {"index": start + offset, "success": False, "error": stream_error}
+    
+    def extract_text_from_document(self, document, filename: str, content_type: str) -> Iterator[Dict[str, Any]]:
+        """Stream a scanned prescription to /extract_text and yield OCR'd pages
+        
+        The file object is sent as the raw request body so it is streamed in chunks
+        rather than re-encoded into a multipart payload. The backend answers with
+        NDJSON, one ``{"page": n, "text": "..."}`` line per page as OCR completes.
+        """
+        if not self.client.supports("/extract_text"):
+            raise RuntimeError("Document OCR is not available on this backend")
+        
+        response = self.client.post(
+            "/extract_text",
+            headers={
+                "x-api-key": API_KEY,
+                "Content-Type": content_type or "application/octet-stream",
+                "X-Filename": filename,
+                "Accept": "application/x-ndjson"
+            },
+            data=document,
+            stream=True,
+            read_timeout=OCR_READ_TIMEOUT
+        )
+        
+        with response:
+            if response.status_code in (404, 405):
+                self.client.mark_unsupported("/extract_text")
+                raise RuntimeError("Document OCR is not available on this backend")
+            if response.status_code != 200:
+                raise RuntimeError(f"API Error {response.status_code}: {response.text}")
+            
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+    
+    def stream_analysis(self, endpoint: str, prescription_text: str, patient_age: Optional[int] = None) -> Iterator[tuple]:
+        """Stream partial results from ``/<endpoint>/stream`` as ``(event, data)`` pairs
+        
+        The backend emits Server-Sent Events in pipeline order: ``medicines`` first,
+        then one ``interaction`` / ``dosage_recommendation`` / ``alternative`` event
+        per finding, then ``alerts``, and finally ``done`` with the full payload.
+        Backends without a streaming route get a single ``done`` event from the
+        regular endpoint. Results served from the local cache arrive as a single
+        ``cached`` event instead, so callers don't report a latency for them.
+        """
+        cache_key = self.result_cache.make_key(endpoint, prescription_text, patient_age)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            yield "cached", cached
+            return
+        
+        payload = {"prescription_text": prescription_text}
+        if endpoint == "check_dosage":
+            payload["patient_age"] = patient_age
+        
+        stream_path = f"/{endpoint}/stream"
+        if not self.client.supports(stream_path):
+            yield from self._stream_fallback(endpoint, prescription_text, patient_age)
+            return
+        
+        response = self.client.post(
+            stream_path,
+            headers={**self.api_headers, "Accept": "text/event-stream"},
+            json=payload,
+            stream=True
+        )
+        
+        with response:
+            if response.status_code in (404, 405):
+                self.client.mark_unsupported(stream_path)
+                yield from self._stream_fallback(endpoint, prescription_text, patient_age)
+                return
+            
+            if response.status_code != 200:
+                yield "error", {"error": f"API Error {response.status_code}: {response.text}"}
+                return
+            
+            event, data_lines = "message", []
+            for line in response.iter_lines(decode_unicode=True):
+                if line is None:
+                    continue
+                if line == "":
+                    if data_lines:
+                        data = json.loads("\n".join(data_lines))
+                        if event == "done":
+                            self.result_cache.put(cache_key, data)
+                        yield event, data
+                    event, data_lines = "message", []
+                elif line.startswith(":"):
+                    continue  # SSE comment / keep-alive
+                elif line.startswith("event:"):
+                    event = line[len("event:"):].strip()
+                elif line.startswith("data:"):
+                    data_lines.append(line[len("data:"):].lstrip())
+    
+    def _stream_fallback(self, endpoint: str, prescription_text: str, patient_age: Optional[int] = None) -> Iterator[tuple]:
+        """Single ``done`` event from the regular endpoint for backends without streaming"""
+        if endpoint == "check_dosage":
+            result = self.call_dosage_endpoint(prescription_text, patient_age)
+        else:
+            result = self.call_interaction_endpoint(prescription_text)
+        if result["success"]:
+            yield ("cached" if result.get("cached") else "done"), result["data"]
+        else:
+            yield "error", {"error": result["error"]}
+    
+    def record_analysis(self, prescription: str, analysis_type: str, results: Dict[str, Any],
+                        patient_age: Optional[int] = None, latency_ms: Optional[float] = None) -> int:
+        """Persist an analysis under this session's history owner"""
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return self.history.add(self.history_owner, prescription, analysis_type, results, timestamp,
+                                patient_age, latency_ms)
+    
+    def check_interactions_incremental(self, prescription_text: str, previous_text: Optional[str],
+                                       previous_result: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Re-check an edited prescription, sending only the spans that changed
+        
+        Returns the merged result plus a ``delta`` of added/removed medicines and
+        interactions relative to ``previous_result``. The backend's incremental
+        route re-extracts only ``changed_spans`` and re-checks pairs involving
+        new drugs; without it the full text is analyzed and the delta is
+        computed here. When no span changed, the previous result is returned
+        with ``unchanged=True`` and no latency, since nothing was re-checked.
+        """
+        if previous_result is None or previous_text is None:
+            result = self.call_interaction_endpoint(prescription_text)
+            if result["success"]:
+                result["delta"] = compute_result_delta({}, result["data"])
+            return result
+        
+        spans = diff_prescription_spans(previous_text, prescription_text)
+        if not spans["added"] and not spans["removed"]:
+            return {"success": True, "data": previous_result, "delta": compute_result_delta(previous_result, previous_result), "unchanged": True}
+        
+        cache_key = self.result_cache.make_key("check_interactions", prescription_text)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return {"success": True, "data": cached, "delta": compute_result_delta(previous_result, cached), "cached": True}
+        
+        if not self.client.supports("/check_interactions/incremental"):
+            return self._incremental_fallback(prescription_text, previous_result)
+        
+        try:
+            payload = {
+                "prescription_text": prescription_text,
+                "changed_spans": spans["added"],
+                "removed_spans": spans["removed"],
+                "previous_medicines": previous_result.get("extracted_medicines", []),
+                "previous_interactions": previous_result.get("interactions", [])
+            }
+            
+            started = time.perf_counter()
+            response = self.client.post(
+                "/check_interactions/incremental",
+                headers=self.api_headers,
+                json=payload
+            )
+            latency_ms = round((time.perf_counter() - started) * 1000, 1)
+            
+            if response.status_code == 200:
+                body = response.json()
+                data = body.get("result", body)
+                delta = body.get("delta") or compute_result_delta(previous_result, data)
+                self.result_cache.put(cache_key, data)
+                return {"success": True, "data": data, "delta": delta, "latency_ms": latency_ms}
+            elif response.status_code in (404, 405):
+                # Backend without incremental support: analyze the full text, diff locally
+                self.client.mark_unsupported("/check_interactions/incremental")
+                return self._incremental_fallback(prescription_text, previous_result)
+            else:
+                return {"success": False, "error": f"API Error {response.status_code}: {response.text}"}
+                
+        except Exception as e:
+            return {"success": False, "error": f"Connection Error: {str(e)}"}
+    
+    def _incremental_fallback(self, prescription_text: str, previous_result: Dict[str, Any]) -> Dict[str, Any]:
+        result = self.call_interaction_endpoint(prescription_text)
+        if result["success"]:
+            result["delta"] = compute_result_delta(previous_result, result["data"])
+        return result
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics for the shared API client"""
+        return self.client.pool_stats()
 
 def render_header():
     """Render the main application header"""
@@ -519,20 +1272,36 @@ def render_sidebar(app: PrescriptionVerifierApp):
     """Render the sidebar with navigation and samples"""
     st.sidebar.title("🧭 Navigation")
     
-    # API Status with better styling
-    api_status = app.check_api_connection()
-    if api_status:
-        st.sidebar.success("✅ Backend Connected")
-    else:
+    # API Status from the cached health probe
+    health = app.get_health_status()
+    latency = f" ({health['latency_ms']:.0f} ms)" if health["latency_ms"] is not None else ""
+    if health["state"] == HealthMonitor.HEALTHY:
+        st.sidebar.success(f"✅ Backend Connected{latency}")
+    elif health["state"] == HealthMonitor.DEGRADED and health["ready"] is False:
+        st.sidebar.warning("⏳ Backend warming up models...")
+    elif health["state"] == HealthMonitor.DEGRADED:
+        st.sidebar.warning(f"🟡 Backend Degraded{latency}")
+    elif health["state"] == HealthMonitor.DOWN:
         st.sidebar.error("❌ Backend Disconnected")
         st.sidebar.warning("⚠️ Start FastAPI server on localhost:8000")
+    else:
+        st.sidebar.info("⏳ Checking backend status...")
+    
+    with st.sidebar.expander("🔌 Connection Pool"):
+        st.json(app.get_pool_stats())
+    
+    with st.sidebar.expander("🗄️ Result Cache"):
+        st.json(app.result_cache.stats())
+        if RESULT_CACHE_ALLOW_CLEAR and st.button("🧹 Clear Cache", key="clear_result_cache"):
+            app.result_cache.clear()
+            st.rerun()
     
     st.sidebar.markdown("---")
     
     # Enhanced navigation with radio buttons
     selected_page = st.sidebar.radio(
         "📱 **Select Page**",
-        ["🏠 Home", "🔍 Drug Interaction Checker", "💊 Dosage & Alternatives", "📊 Analysis History"],
+        ["🏠 Home", "🔍 Drug Interaction Checker", "💊 Dosage & Alternatives", "📦 Batch Verification", "📊 Analysis History", "📈 History Analytics"],
         index=0
     )
     
@@ -574,60 +1343,10 @@ def render_sidebar(app: PrescriptionVerifierApp):
     
     return selected_page
 
-def render_home_page():
+def render_home_page(app: PrescriptionVerifierApp):
     """Render the home page with overview and quick test"""
-    # Hero Section
-    st.markdown("""
-    <div class="hero-section">
-        <h1>Welcome to AI Prescription Verifier</h1>
-        <p>Advanced AI-powered system for detecting drug interactions, verifying dosages, and ensuring medication safety</p>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Features Grid
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown("""
-        <div class="feature-card">
-            <h3>🔍 Drug Interaction Analysis</h3>
-            <ul>
-                <li>Hugging Face Posos/ClinicalNER for drug extraction</li>
-                <li>IBM Watson NLU for context analysis</li>
-                <li>Comprehensive DDI dataset validation</li>
-                <li>Real-time interaction detection</li>
-                <li>Evidence-based recommendations</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class="feature-card">
-            <h3>💊 Dosage Verification</h3>
-            <ul>
-                <li>RxNorm API integration</li>
-                <li>Age-based dosage recommendations</li>
-                <li>Pediatric & geriatric considerations</li>
-                <li>Alternative drug suggestions</li>
-                <li>Safety threshold monitoring</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
-    
-    with col3:
-        st.markdown("""
-        <div class="feature-card">
-            <h3>🎯 Key Features</h3>
-            <ul>
-                <li>Real-time prescription analysis</li>
-                <li>Scientific drug mapping (RxCUI)</li>
-                <li>Context-aware safety alerts</li>
-                <li>Comprehensive reporting</li>
-                <li>Export functionality</li>
-            </ul>
-        </div>
-        """, unsafe_allow_html=True)
+    # Hero section and feature grid
+    st.markdown(load_static_asset("home.html"), unsafe_allow_html=True)
     
     # Quick test section
     st.markdown("---")
@@ -651,7 +1370,6 @@ def render_home_page():
         if st.button("🔍 Check Interactions", type="primary", use_container_width=True):
             if test_text.strip():
                 with st.spinner("🔄 Analyzing interactions..."):
-                    app = PrescriptionVerifierApp()
                     result = app.call_interaction_endpoint(test_text)
                     
                     if result["success"]:
@@ -659,16 +1377,7 @@ def render_home_page():
                         total_interactions = data.get("total_interactions", 0)
                         
                         # Store in analysis history
-                        if 'analysis_history' not in st.session_state:
-                            st.session_state.analysis_history = []
-                        
-                        # Add current analysis to history
-                        st.session_state.analysis_history.append({
-                            'prescription': test_text,
-                            'type': 'Quick Interaction Check',
-                            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            'results': data
-                        })
+                        app.record_analysis(test_text, 'Quick Interaction Check', data, latency_ms=result.get("latency_ms"))
                         
                         if total_interactions > 0:
                             st.error(f"🚨 Found {total_interactions} potential interaction(s)")
@@ -713,23 +1422,13 @@ def render_home_page():
         if st.button("💊 Check Dosage", type="secondary", use_container_width=True):
             if test_text.strip():
                 with st.spinner("🔄 Verifying dosage..."):
-                    app = PrescriptionVerifierApp()
                     result = app.call_dosage_endpoint(test_text, 45)  # Default age
                     
                     if result["success"]:
                         data = result["data"]
                         
-                        # Store in analysis history
-                        if 'analysis_history' not in st.session_state:
-                            st.session_state.analysis_history = []
-                        
-                        # Add current analysis to history
-                        st.session_state.analysis_history.append({
-                            'prescription': test_text,
-                            'type': 'Quick Dosage Check',
-                            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            'results': data
-                        })
+                        # Store in analysis history; 45 is only the quick check's default, not the patient's age
+                        app.record_analysis(test_text, 'Quick Dosage Check', data, latency_ms=result.get("latency_ms"))
                         
                         st.success(f"✅ Analyzed {len(data.get('extracted_medicines', []))} medicines")
                         
@@ -746,6 +1445,323 @@ def render_home_page():
                         st.error(f"❌ Error: {result.get('error', 'Failed to analyze dosage')}")
             else:
                 st.warning("⚠️ Please enter prescription text to analyze")
+        
+        if st.button("🧪 Full Verification", type="secondary", use_container_width=True):
+            if test_text.strip():
+                with st.spinner("🔄 Verifying interactions and dosage..."):
+                    result = app.verify(test_text, 45, st.empty())  # Default age
+                    
+                    if result["success"]:
+                        data = result["data"]
+                        
+                        # Store in analysis history; 45 is only the quick check's default, not the patient's age
+                        app.record_analysis(test_text, 'Full Verification', data, latency_ms=result.get("latency_ms"))
+                        
+                        total_interactions = data.get("total_interactions", 0)
+                        if total_interactions > 0:
+                            st.error(f"🚨 Found {total_interactions} potential interaction(s)")
+                            for interaction in data.get("interactions", []):
+                                st.warning(f"**{interaction.get('drug_a', 'Unknown')} + {interaction.get('drug_b', 'Unknown')}:** {interaction.get('severity', 'Unknown')} - {interaction.get('mechanism', 'Not specified')}")
+                        else:
+                            st.success("✅ No potential drug interactions detected")
+                        
+                        if data.get('dosage_recommendations'):
+                            st.subheader("⚠️ **Dosage Recommendations**")
+                            for rec in data['dosage_recommendations']:
+                                st.warning(f"**{rec.get('medicine', 'Unknown')}:** {rec.get('recommendation', 'No recommendation')}")
+                        
+                        if data.get('alternatives'):
+                            st.subheader("🔄 **Alternative Medications**")
+                            alternatives_df = pd.DataFrame(data['alternatives'])
+                            st.dataframe(alternatives_df, use_container_width=True)
+                        
+                        if data.get('extracted_medicines'):
+                            st.subheader("💊 **Extracted Medicines**")
+                            medicines_df = pd.DataFrame([{"Medicine": med} for med in data.get('extracted_medicines', [])])
+                            st.dataframe(medicines_df, use_container_width=True)
+                    else:
+                        st.error(f"❌ Error: {result.get('error', 'Failed to verify prescription')}")
+            else:
+                st.warning("⚠️ Please enter prescription text to analyze")
+
+def render_document_upload(app: PrescriptionVerifierApp, text_key: str):
+    """Render a scanned-prescription uploader that fills the given text area via OCR"""
+    uploaded_file = st.file_uploader(
+        "**📷 Or upload a scanned prescription (image/PDF):**",
+        type=OCR_UPLOAD_TYPES,
+        key=f"{text_key}_document"
+    )
+    
+    if uploaded_file is None:
+        return
+    
+    # Only OCR each upload once, not on every rerun, whether it succeeded or failed. The
+    # id is unique per upload, so a different scan with the same name and size is new.
+    upload_id = getattr(uploaded_file, "file_id", None) or hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+    if st.session_state.get(f"{text_key}_document_id") == upload_id:
+        error = st.session_state.get(f"{text_key}_document_error")
+        if error:
+            st.error(f"❌ OCR failed: {error}")
+        return
+    
+    st.session_state[f"{text_key}_document_id"] = upload_id
+    st.session_state[f"{text_key}_document_error"] = None
+    
+    pages = []
+    status = st.empty()
+    try:
+        for page in app.extract_text_from_document(uploaded_file, uploaded_file.name, uploaded_file.type):
+            pages.append(page.get("text", ""))
+            status.markdown(f"🔄 Recognized page **{page.get('page', len(pages))}**...")
+    except Exception as e:
+        status.empty()
+        st.session_state[f"{text_key}_document_error"] = str(e)
+        st.error(f"❌ OCR failed: {str(e)}")
+        return
+    
+    status.empty()
+    text = "\n".join(page_text for page_text in pages if page_text.strip())
+    st.session_state.prescription_text = text
+    st.session_state[text_key] = text
+    st.session_state[f"{text_key}_synced"] = text
+    st.success(f"✅ Extracted text from {len(pages)} page(s)")
+
+def sync_prescription_input(text_key: str):
+    """Seed a page's text area from the shared prescription text when it changed elsewhere
+    
+    The text area is driven only through its session-state key (no ``value=``), so
+    samples, OCR and "Clear" update it by writing the shared text here.
+    """
+    shared = st.session_state.get('prescription_text', '')
+    synced_key = f"{text_key}_synced"
+    if text_key not in st.session_state or st.session_state.get(synced_key) != shared:
+        st.session_state[text_key] = shared
+        st.session_state[synced_key] = shared
+
+def render_live_analysis(app: PrescriptionVerifierApp, container, endpoint: str,
+                         prescription_text: str, patient_age: Optional[int] = None) -> Dict[str, Any]:
+    """Render streamed partial results into ``container`` and return the final result"""
+    data: Dict[str, Any] = {}
+    with container:
+        status = st.empty()
+        medicines_area = st.empty()
+        findings_area = st.container()
+    
+    status.info("🔄 Extracting medicines...")
+    started = time.perf_counter()
+    done = cached = False
+    try:
+        for event, payload in app.stream_analysis(endpoint, prescription_text, patient_age):
+            if event == "error":
+                status.empty()
+                return {"success": False, "error": payload.get("error", "Unknown error")}
+            elif event == "medicines":
+                data["extracted_medicines"] = payload.get("extracted_medicines", [])
+                medicines_area.markdown("**💊 Medicines:** " + ", ".join(data["extracted_medicines"]))
+                status.info("🔄 Checking medicines...")
+            elif event == "interaction":
+                data.setdefault("interactions", []).append(payload)
+                findings_area.warning(f"**{payload.get('drug_a', 'Unknown')} + {payload.get('drug_b', 'Unknown')}:** {payload.get('severity', 'Unknown')}")
+            elif event == "dosage_recommendation":
+                data.setdefault("dosage_recommendations", []).append(payload)
+                findings_area.warning(f"**{payload.get('medicine', 'Unknown')}:** {payload.get('recommendation', 'No recommendation')}")
+            elif event == "alternative":
+                data.setdefault("alternatives", []).append(payload)
+                findings_area.info(f"**{payload.get('original_drug', 'Unknown')} → {payload.get('alternative_drug', 'Unknown')}**")
+            elif event == "alerts":
+                data["alerts"] = payload.get("alerts", [])
+                status.info("🔄 Finalizing analysis...")
+            elif event in ("done", "cached"):
+                data.update(payload)
+                done = True
+                cached = event == "cached"
+    except Exception as e:
+        status.empty()
+        return {"success": False, "error": f"Connection Error: {str(e)}"}
+    
+    status.empty()
+    if not done:
+        # Findings shown so far are incomplete; don't let them be cached or recorded
+        return {"success": False, "error": "Stream ended before the analysis finished; partial results were discarded"}
+    if endpoint == "check_interactions":
+        data.setdefault("total_interactions", len(data.get("interactions", [])))
+    if cached:
+        # No request was made, so there is no latency to report or record
+        return {"success": True, "data": data, "cached": True, "latency_ms": None}
+    return {"success": True, "data": data, "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+def get_result_view(name: str, data: Dict[str, Any], builder) -> Dict[str, Any]:
+    """Return the view-model for a result, rebuilding it only when the result object changes
+    
+    Results in session state keep their identity across reruns, so an identity check is
+    enough to reuse DataFrames and formatted HTML when only an unrelated widget changed.
+    """
+    views = st.session_state.setdefault("result_views", {})
+    cached = views.get(name)
+    if cached is None or cached[0] is not data:
+        cached = (data, builder(data))
+        views[name] = cached
+    return cached[1]
+
+def build_interaction_view(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Precompute frames and formatted blocks for the interaction results view"""
+    total_interactions = data.get("total_interactions", 0)
+    metric_cards = [
+        """
+            <div class="metric-card">
+                <h3 style="color: #2563eb; margin: 0;">💊</h3>
+                <h2 style="color: #1e293b; margin: 0.5rem 0 0 0;">{}</h2>
+                <p style="color: #64748b; margin: 0; font-weight: 500;">Medicines Found</p>
+            </div>
+        """.format(len(data.get('extracted_medicines', []))),
+        """
+            <div class="metric-card">
+                <h3 style="color: {}; margin: 0;">⚠️</h3>
+                <h2 style="color: #1e293b; margin: 0.5rem 0 0 0;">{}</h2>
+                <p style="color: #64748b; margin: 0; font-weight: 500;">Interactions</p>
+            </div>
+        """.format("#dc2626" if total_interactions > 0 else "#059669", total_interactions),
+        """
+            <div class="metric-card">
+                <h3 style="color: #d97706; margin: 0;">🧠</h3>
+                <h2 style="color: #1e293b; margin: 0.5rem 0 0 0;">{}</h2>
+                <p style="color: #64748b; margin: 0; font-weight: 500;">AI Alerts</p>
+            </div>
+        """.format(len(data.get('alerts', [])))
+    ]
+    
+    medicines_df = None
+    if data.get('extracted_medicines'):
+        medicines_df = pd.DataFrame([
+            {"Medicine": med, "Status": "✅ Detected"} 
+            for med in data['extracted_medicines']
+        ])
+    
+    # Index Watson NLU alerts by pair once instead of scanning them per interaction
+    alerts_by_pair = {}
+    for alert in data.get('alerts', []):
+        alerts_by_pair.setdefault(alert.get('interaction_pair'), alert)
+    
+    interactions = []
+    for i, interaction in enumerate(data.get("interactions", []), 1):
+        severity = interaction.get('severity', 'UNKNOWN').upper()
+        
+        # Choose icon and color based on severity
+        if severity == 'CRITICAL':
+            icon = "🔴"
+            severity_color = "color: #dc2626; font-weight: bold;"
+        elif severity == 'WARNING':
+            icon = "🟡"
+            severity_color = "color: #d97706; font-weight: bold;"
+        else:
+            icon = "🟢"
+            severity_color = "color: #059669; font-weight: bold;"
+        
+        interactions.append({
+            "title": f"{icon} **Interaction {i}:** {interaction.get('drug_a', 'Unknown')} + {interaction.get('drug_b', 'Unknown')} - {severity}",
+            "severity": severity,
+            "severity_color": severity_color,
+            "mechanism": interaction.get('mechanism', 'Not specified'),
+            "reference": interaction.get('reference', 'Internal Database'),
+            "description": interaction.get('description', 'No description available'),
+            "alert": alerts_by_pair.get(f"{interaction.get('drug_a')} ↔ {interaction.get('drug_b')}")
+        })
+    
+    interactions_csv = pd.DataFrame(data["interactions"]).to_csv(index=False) if data.get("interactions") else ""
+    
+    return {
+        "metric_cards": metric_cards,
+        "medicines_df": medicines_df,
+        "interactions": interactions,
+        "interactions_csv": interactions_csv
+    }
+
+def build_dosage_view(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Precompute frames and formatted blocks for the dosage results view"""
+    metric_cards = [
+        """
+            <div class="metric-card">
+                <h3 style="color: #059669;">💊</h3>
+                <h2 style="color: #1e293b;">{}</h2>
+                <p style="color: #64748b; font-weight: 500;">Medicines Analyzed</p>
+            </div>
+        """.format(len(data.get('extracted_medicines', []))),
+        """
+            <div class="metric-card">
+                <h3 style="color: #d97706;">🔄</h3>
+                <h2 style="color: #1e293b;">{}</h2>
+                <p style="color: #64748b; font-weight: 500;">Alternatives Found</p>
+            </div>
+        """.format(len(data.get('alternatives', [])))
+    ]
+    
+    medicines_df = None
+    if data.get('extracted_medicines'):
+        medicines_df = pd.DataFrame([
+            {"Medicine": med, "Status": "✅ Analyzed"} 
+            for med in data['extracted_medicines']
+        ])
+    
+    dosage_recs = []
+    for rec in data.get('dosage_recommendations', []):
+        recommendation = rec.get('recommendation', 'No specific recommendation')
+        text = recommendation.lower()
+        if 'reduce' in text or 'lower' in text:
+            kind = "adjust"
+        elif 'avoid' in text or 'contraindicated' in text:
+            kind = "contraindication"
+        else:
+            kind = "note"
+        dosage_recs.append({
+            "title": f"💊 **{rec.get('medicine', 'Unknown')}** - {rec.get('age_group', 'N/A').title()} Patient",
+            "recommendation": recommendation,
+            "kind": kind
+        })
+    
+    alternatives_df = None
+    if data.get('alternatives'):
+        alternatives_df = pd.DataFrame([
+            {
+                "Original Drug": alt.get('original_drug', 'Unknown'),
+                "Alternative Drug": alt.get('alternative_drug', 'Unknown'),
+                "Reason": alt.get('reason', 'Same therapeutic class'),
+                "Dosage Form": alt.get('dosage_form', 'Various forms available')
+            }
+            for alt in data['alternatives']
+        ])
+    
+    return {
+        "metric_cards": metric_cards,
+        "medicines_df": medicines_df,
+        "dosage_recs": dosage_recs,
+        "alternatives_df": alternatives_df
+    }
+
+def render_latency_breakdown(data: Dict[str, Any], client_latency_ms: Optional[float]):
+    """Show client round-trip time against the server's per-stage ``timings`` block"""
+    timings = data.get("timings") or {}
+    if client_latency_ms is None and not timings:
+        return
+    
+    with st.expander("⏱️ **Latency Breakdown**"):
+        rows = []
+        server_total = timings.get("total_ms")
+        for stage, duration in timings.items():
+            if stage != "total_ms":
+                rows.append({"Stage": stage.replace("_ms", "").replace("_", " ").title(), "Duration (ms)": round(duration, 1)})
+        if server_total is None and rows:
+            server_total = sum(row["Duration (ms)"] for row in rows)
+        
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Client round trip", f"{client_latency_ms:.0f} ms" if client_latency_ms is not None else "Cached")
+        col2.metric("Server processing", f"{server_total:.0f} ms" if server_total is not None else "N/A")
+        if client_latency_ms is not None and server_total is not None:
+            col3.metric("Network & queueing", f"{max(client_latency_ms - server_total, 0):.0f} ms")
+        
+        if rows:
+            st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        else:
+            st.caption("The backend did not report per-stage timings for this analysis.")
 
 def render_interaction_checker(app: PrescriptionVerifierApp):
     """Render drug interaction checker page"""
@@ -754,11 +1770,14 @@ def render_interaction_checker(app: PrescriptionVerifierApp):
     
     # Input section
     col1, col2 = st.columns([3, 1])
+    live_area = st.container()
     
     with col1:
+        render_document_upload(app, "interaction_prescription")
+        sync_prescription_input("interaction_prescription")
+        
         prescription_text = st.text_area(
             "**Enter Prescription Text:**",
-            value=st.session_state.get('prescription_text', ''),
             placeholder="Enter complete prescription details including drug names, dosages, and patient information...",
             height=150,
             key="interaction_prescription"
@@ -766,29 +1785,52 @@ def render_interaction_checker(app: PrescriptionVerifierApp):
     
     with col2:
         st.markdown("**Analysis Options:**")
+        incremental = st.checkbox(
+            "⚡ Incremental re-analysis",
+            value=True,
+            help="When editing the last analyzed prescription, only re-check the parts that changed"
+        )
+        interaction_patient_age = st.number_input(
+            "**Patient Age (optional):**",
+            min_value=0,
+            max_value=120,
+            value=None,
+            step=1,
+            key="interaction_patient_age",
+            help="Not used by the interaction check; recorded so History Analytics can break interactions down by age group"
+        )
+        
         if st.button("🔍 Analyze Interactions", type="primary", use_container_width=True):
             if prescription_text.strip():
                 with st.spinner("🔄 Running comprehensive analysis..."):
-                    result = app.call_interaction_endpoint(prescription_text)
+                    previous_text = st.session_state.get('interaction_result_text')
+                    # Only an edit of the previous prescription benefits from the incremental
+                    # path; unrelated text is streamed like a first analysis
+                    if (incremental and 'interaction_result' in st.session_state and previous_text
+                            and diff_prescription_spans(previous_text, prescription_text)["unchanged"]):
+                        result = app.check_interactions_incremental(
+                            prescription_text,
+                            previous_text,
+                            st.session_state.interaction_result
+                        )
+                    else:
+                        result = render_live_analysis(app, live_area, "check_interactions", prescription_text)
                     
                     if result["success"]:
                         data = result["data"]
                         
                         # Store result for display
                         st.session_state.interaction_result = data
+                        st.session_state.interaction_result_text = prescription_text
+                        st.session_state.interaction_delta = result.get("delta")
                         st.session_state.prescription_text = prescription_text
                         
-                        # Store in analysis history
-                        if 'analysis_history' not in st.session_state:
-                            st.session_state.analysis_history = []
-                        
-                        # Add current analysis to history
-                        st.session_state.analysis_history.append({
-                            'prescription': prescription_text,
-                            'type': 'Drug Interaction Check',
-                            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            'results': data
-                        })
+                        # Nothing was re-checked for unchanged text, so keep the previous
+                        # latency and don't record a duplicate analysis
+                        if not result.get("unchanged"):
+                            st.session_state.interaction_latency_ms = result.get("latency_ms")
+                            app.record_analysis(prescription_text, 'Drug Interaction Check', data,
+                                                interaction_patient_age, result.get("latency_ms"))
                         
                         st.rerun()
                     else:
@@ -797,9 +1839,11 @@ def render_interaction_checker(app: PrescriptionVerifierApp):
                 st.warning("⚠️ Please enter prescription text to analyze")
         
         if st.button("🔄 Clear Results", use_container_width=True):
-            if 'interaction_result' in st.session_state:
-                del st.session_state.interaction_result
+            for key in ('interaction_result', 'interaction_result_text', 'interaction_delta'):
+                if key in st.session_state:
+                    del st.session_state[key]
             st.session_state.prescription_text = ""
+            st.session_state.pop("interaction_prescription_synced", None)
             st.rerun()
     
     # Display results if available
@@ -807,98 +1851,68 @@ def render_interaction_checker(app: PrescriptionVerifierApp):
         st.markdown("---")
         data = st.session_state.interaction_result
         
+        view = get_result_view("interaction", data, build_interaction_view)
+        
         # Summary metrics
         col1, col2, col3, col4 = st.columns(4)
         
-        with col1:
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="color: #2563eb; margin: 0;">💊</h3>
-                <h2 style="color: #1e293b; margin: 0.5rem 0 0 0;">{}</h2>
-                <p style="color: #64748b; margin: 0; font-weight: 500;">Medicines Found</p>
-            </div>
-            """.format(len(data.get('extracted_medicines', []))), unsafe_allow_html=True)
-        
-        with col2:
-            total_interactions = data.get("total_interactions", 0)
-            color = "#dc2626" if total_interactions > 0 else "#059669"
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="color: {}; margin: 0;">⚠️</h3>
-                <h2 style="color: #1e293b; margin: 0.5rem 0 0 0;">{}</h2>
-                <p style="color: #64748b; margin: 0; font-weight: 500;">Interactions</p>
-            </div>
-            """.format(color, total_interactions), unsafe_allow_html=True)
-        
-        with col3:
-            alerts_count = len(data.get('alerts', []))
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="color: #d97706; margin: 0;">🧠</h3>
-                <h2 style="color: #1e293b; margin: 0.5rem 0 0 0;">{}</h2>
-                <p style="color: #64748b; margin: 0; font-weight: 500;">AI Alerts</p>
-            </div>
-            """.format(alerts_count), unsafe_allow_html=True)
+        for col, card in zip((col1, col2, col3), view["metric_cards"]):
+            with col:
+                st.markdown(card, unsafe_allow_html=True)
         
         with col4:
-            timestamp = datetime.now().strftime("%H:%M:%S")
+            latency_ms = st.session_state.get('interaction_latency_ms')
             st.markdown("""
             <div class="metric-card">
                 <h3 style="color: #059669; margin: 0;">⏱️</h3>
                 <h2 style="color: #1e293b; margin: 0.5rem 0 0 0; font-size: 1.2rem;">{}</h2>
                 <p style="color: #64748b; margin: 0; font-weight: 500;">Analysis Time</p>
             </div>
-            """.format(timestamp), unsafe_allow_html=True)
+            """.format(f"{latency_ms:.0f} ms" if latency_ms is not None else "Cached"), unsafe_allow_html=True)
+        
+        render_latency_breakdown(data, st.session_state.get('interaction_latency_ms'))
+        
+        # Changes since the previous analysis (incremental mode)
+        delta = st.session_state.get('interaction_delta')
+        if delta and any(delta.values()):
+            changes = []
+            if delta["added_medicines"]:
+                changes.append(f"**➕ Added:** {', '.join(delta['added_medicines'])}")
+            if delta["removed_medicines"]:
+                changes.append(f"**➖ Removed:** {', '.join(delta['removed_medicines'])}")
+            for interaction in delta["added_interactions"]:
+                changes.append(f"**🆕 New interaction:** {interaction.get('drug_a', 'Unknown')} + {interaction.get('drug_b', 'Unknown')} ({interaction.get('severity', 'Unknown')})")
+            for interaction in delta["removed_interactions"]:
+                changes.append(f"**✅ Resolved interaction:** {interaction.get('drug_a', 'Unknown')} + {interaction.get('drug_b', 'Unknown')}")
+            st.info("🔁 **Changes since last analysis**\n\n" + "\n\n".join(changes))
         
         # Extracted medicines
-        if data.get('extracted_medicines'):
+        if view["medicines_df"] is not None:
             st.markdown("## 💊 **Extracted Medicines**")
-            medicines_df = pd.DataFrame([
-                {"Medicine": med, "Status": "✅ Detected"} 
-                for med in data['extracted_medicines']
-            ])
-            st.dataframe(medicines_df, use_container_width=True)
+            st.dataframe(view["medicines_df"], use_container_width=True)
         
         # Drug interactions
-        interactions = data.get("interactions", [])
+        interactions = view["interactions"]
         if interactions:
             st.markdown("## ⚠️ **Drug-Drug Interactions**")
             
-            for i, interaction in enumerate(interactions, 1):
-                severity = interaction.get('severity', 'UNKNOWN').upper()
-                
-                # Choose icon and color based on severity
-                if severity == 'CRITICAL':
-                    icon = "🔴"
-                    severity_color = "color: #dc2626; font-weight: bold;"
-                elif severity == 'WARNING':
-                    icon = "🟡"
-                    severity_color = "color: #d97706; font-weight: bold;"
-                else:
-                    icon = "🟢"
-                    severity_color = "color: #059669; font-weight: bold;"
-                
-                with st.expander(f"{icon} **Interaction {i}:** {interaction.get('drug_a', 'Unknown')} + {interaction.get('drug_b', 'Unknown')} - {severity}"):
+            for row in interactions:
+                with st.expander(row["title"]):
                     col1, col2 = st.columns(2)
                     
                     with col1:
-                        st.markdown(f"**🎯 Severity:** <span style='{severity_color}'>{severity}</span>", unsafe_allow_html=True)
-                        st.markdown(f"**🔧 Mechanism:** {interaction.get('mechanism', 'Not specified')}")
-                        st.markdown(f"**📚 Source:** {interaction.get('reference', 'Internal Database')}")
+                        st.markdown(f"**🎯 Severity:** <span style='{row['severity_color']}'>{row['severity']}</span>", unsafe_allow_html=True)
+                        st.markdown(f"**🔧 Mechanism:** {row['mechanism']}")
+                        st.markdown(f"**📚 Source:** {row['reference']}")
                     
                     with col2:
                         # Show Watson NLU alert if available
-                        matching_alert = None
-                        for alert in data.get('alerts', []):
-                            if alert.get('interaction_pair') == f"{interaction.get('drug_a')} ↔ {interaction.get('drug_b')}":
-                                matching_alert = alert
-                                break
-                        
+                        matching_alert = row["alert"]
                         if matching_alert:
                             st.info(f"**🧠 AI Analysis:** {matching_alert.get('alert_message', 'Interaction detected')}")
                             st.success(f"**💡 Recommendation:** {matching_alert.get('recommendation', 'Consult healthcare provider')}")
                     
-                    st.markdown(f"**📄 Description:** {interaction.get('description', 'No description available')}")
+                    st.markdown(f"**📄 Description:** {row['description']}")
         else:
             st.success("✅ **No drug interactions detected!** The analyzed medications appear to be safe when used together.")
         
@@ -923,11 +1937,9 @@ def render_interaction_checker(app: PrescriptionVerifierApp):
         
         with col2:
             if interactions:
-                interactions_df = pd.DataFrame(interactions)
-                csv_data = interactions_df.to_csv(index=False)
                 st.download_button(
                     label="📊 Download CSV Data",
-                    data=csv_data,
+                    data=view["interactions_csv"],
                     file_name=f"interactions_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
                     mime="text/csv"
                 )
@@ -939,11 +1951,14 @@ def render_dosage_checker(app: PrescriptionVerifierApp):
     
     # Input section
     col1, col2 = st.columns([2, 1])
+    live_area = st.container()
     
     with col1:
+        render_document_upload(app, "dosage_prescription")
+        sync_prescription_input("dosage_prescription")
+        
         prescription_text = st.text_area(
             "**Enter Prescription Text:**",
-            value=st.session_state.get('prescription_text', ''),
             placeholder="Enter prescription with dosage details and patient information...",
             height=150,
             key="dosage_prescription"
@@ -971,25 +1986,17 @@ def render_dosage_checker(app: PrescriptionVerifierApp):
         if st.button("💊 Analyze Dosage", type="primary", use_container_width=True):
             if prescription_text.strip():
                 with st.spinner("🔄 Analyzing dosage and finding alternatives..."):
-                    result = app.call_dosage_endpoint(prescription_text, patient_age)
+                    result = render_live_analysis(app, live_area, "check_dosage", prescription_text, patient_age)
                     
                     if result["success"]:
                         data = result["data"]
                         st.session_state.dosage_result = data
+                        st.session_state.dosage_latency_ms = result.get("latency_ms")
                         st.session_state.prescription_text = prescription_text
                         st.session_state.patient_age = patient_age
                         
                         # Store in analysis history
-                        if 'analysis_history' not in st.session_state:
-                            st.session_state.analysis_history = []
-                        
-                        # Add current analysis to history
-                        st.session_state.analysis_history.append({
-                            'prescription': prescription_text,
-                            'type': 'Dosage & Alternatives Check',
-                            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            'results': data
-                        })
+                        app.record_analysis(prescription_text, 'Dosage & Alternatives Check', data, patient_age, result.get("latency_ms"))
                         
                         st.rerun()
                     else:
@@ -1001,6 +2008,7 @@ def render_dosage_checker(app: PrescriptionVerifierApp):
     if 'dosage_result' in st.session_state:
         st.markdown("---")
         data = st.session_state.dosage_result
+        view = get_result_view("dosage", data, build_dosage_view)
         
         # Summary metrics
         col1, col2, col3 = st.columns(3)
@@ -1014,70 +2022,36 @@ def render_dosage_checker(app: PrescriptionVerifierApp):
             </div>
             """.format(st.session_state.get('patient_age', 'N/A')), unsafe_allow_html=True)
         
-        with col2:
-            medicines_count = len(data.get('extracted_medicines', []))
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="color: #059669;">💊</h3>
-                <h2 style="color: #1e293b;">{}</h2>
-                <p style="color: #64748b; font-weight: 500;">Medicines Analyzed</p>
-            </div>
-            """.format(medicines_count), unsafe_allow_html=True)
-        
-        with col3:
-            alternatives_count = len(data.get('alternatives', []))
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="color: #d97706;">🔄</h3>
-                <h2 style="color: #1e293b;">{}</h2>
-                <p style="color: #64748b; font-weight: 500;">Alternatives Found</p>
-            </div>
-            """.format(alternatives_count), unsafe_allow_html=True)
+        for col, card in zip((col2, col3), view["metric_cards"]):
+            with col:
+                st.markdown(card, unsafe_allow_html=True)
         
         # Extracted medicines
-        if data.get('extracted_medicines'):
+        if view["medicines_df"] is not None:
             st.markdown("## 💊 **Extracted Medicines**")
-            medicines_df = pd.DataFrame([
-                {"Medicine": med, "Status": "✅ Analyzed"} 
-                for med in data['extracted_medicines']
-            ])
-            st.dataframe(medicines_df, use_container_width=True)
+            st.dataframe(view["medicines_df"], use_container_width=True)
         
         # Dosage recommendations
-        dosage_recs = data.get('dosage_recommendations', [])
+        dosage_recs = view["dosage_recs"]
         if dosage_recs:
             st.markdown("## ⚠️ **Dosage Recommendations**")
             
-            for i, rec in enumerate(dosage_recs, 1):
-                medicine = rec.get('medicine', 'Unknown')
-                age_group = rec.get('age_group', 'N/A')
-                recommendation = rec.get('recommendation', 'No specific recommendation')
-                
-                with st.expander(f"💊 **{medicine}** - {age_group.title()} Patient"):
-                    if 'reduce' in recommendation.lower() or 'lower' in recommendation.lower():
-                        st.warning(f"**⬇️ Dosage Adjustment Needed:** {recommendation}")
-                    elif 'avoid' in recommendation.lower() or 'contraindicated' in recommendation.lower():
-                        st.error(f"**🚫 Contraindication:** {recommendation}")
+            for rec in dosage_recs:
+                with st.expander(rec["title"]):
+                    if rec["kind"] == "adjust":
+                        st.warning(f"**⬇️ Dosage Adjustment Needed:** {rec['recommendation']}")
+                    elif rec["kind"] == "contraindication":
+                        st.error(f"**🚫 Contraindication:** {rec['recommendation']}")
                     else:
-                        st.info(f"**ℹ️ Clinical Note:** {recommendation}")
+                        st.info(f"**ℹ️ Clinical Note:** {rec['recommendation']}")
         
         # Alternative medications
         alternatives = data.get('alternatives', [])
-        if alternatives:
+        if view["alternatives_df"] is not None:
             st.markdown("## 🔄 **Alternative Medications**")
-            
-            alternatives_data = []
-            for alt in alternatives:
-                alternatives_data.append({
-                    "Original Drug": alt.get('original_drug', 'Unknown'),
-                    "Alternative Drug": alt.get('alternative_drug', 'Unknown'),
-                    "Reason": alt.get('reason', 'Same therapeutic class'),
-                    "Dosage Form": alt.get('dosage_form', 'Various forms available')
-                })
-            
-            if alternatives_data:
-                alternatives_df = pd.DataFrame(alternatives_data)
-                st.dataframe(alternatives_df, use_container_width=True)
+            st.dataframe(view["alternatives_df"], use_container_width=True)
+        
+        render_latency_breakdown(data, st.session_state.get('dosage_latency_ms'))
         
         # If no issues found
         if not dosage_recs and not alternatives:
@@ -1087,26 +2061,223 @@ def render_dosage_checker(app: PrescriptionVerifierApp):
             The prescribed medications and dosages appear appropriate for the patient's age group based on current clinical guidelines.
             """)
 
-def render_analysis_history():
+def split_prescription_spans(text: str) -> List[str]:
+    """Split prescription text into clause-level spans (one drug line each, typically)
+    
+    Commas between digits ("1,000mg") are thousands separators, not clause breaks.
+    """
+    return [span.strip() for span in re.split(r"[\n;]|(?<!\d),|,(?!\d)|(?<=\.)\s+", text) if span and span.strip()]
+
+def diff_prescription_spans(previous_text: str, text: str) -> Dict[str, List[str]]:
+    """Spans added, removed or left unchanged between two versions of a prescription
+    
+    Clause order doesn't change the analysis, so spans are compared as multisets:
+    moving a drug line is not an edit.
+    """
+    previous_spans = split_prescription_spans(previous_text)
+    spans = split_prescription_spans(text)
+    
+    remaining = Counter(previous_spans)
+    added, unchanged = [], []
+    for span in spans:
+        if remaining[span]:
+            remaining[span] -= 1
+            unchanged.append(span)
+        else:
+            added.append(span)
+    
+    removed = []
+    for span in previous_spans:
+        if remaining[span]:
+            remaining[span] -= 1
+            removed.append(span)
+    return {"added": added, "removed": removed, "unchanged": unchanged}
+
+def compute_result_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Medicines and interactions added or removed between two interaction results"""
+    def pair_key(interaction):
+        return tuple(sorted((str(interaction.get('drug_a', '')).lower(), str(interaction.get('drug_b', '')).lower())))
+    
+    previous_meds = {str(med).lower(): med for med in previous.get('extracted_medicines', [])}
+    current_meds = {str(med).lower(): med for med in current.get('extracted_medicines', [])}
+    previous_pairs = {pair_key(i): i for i in previous.get('interactions', [])}
+    current_pairs = {pair_key(i): i for i in current.get('interactions', [])}
+    
+    return {
+        "added_medicines": [med for key, med in current_meds.items() if key not in previous_meds],
+        "removed_medicines": [med for key, med in previous_meds.items() if key not in current_meds],
+        "added_interactions": [i for key, i in current_pairs.items() if key not in previous_pairs],
+        "removed_interactions": [i for key, i in previous_pairs.items() if key not in current_pairs]
+    }
+
+def parse_batch_file(uploaded_file) -> List[Dict[str, Any]]:
+    """Parse an uploaded CSV or JSONL file into batch verification items"""
+    if uploaded_file.name.lower().endswith(".csv"):
+        df = pd.read_csv(uploaded_file)
+        if "prescription_text" not in df.columns:
+            raise ValueError("CSV must contain a 'prescription_text' column")
+        if "patient_age" not in df.columns:
+            df["patient_age"] = None
+        df = df.astype(object).where(pd.notnull(df), None)
+        items = df[["prescription_text", "patient_age"]].to_dict("records")
+    else:
+        items = []
+        for line_number, line in enumerate(uploaded_file.getvalue().decode("utf-8").splitlines(), 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if "prescription_text" not in record:
+                raise ValueError(f"Line {line_number} is missing 'prescription_text'")
+            items.append({"prescription_text": record["prescription_text"], "patient_age": record.get("patient_age")})
+    
+    for item in items:
+        if item["patient_age"] is not None:
+            item["patient_age"] = int(item["patient_age"])
+    return items
+
+def render_batch_verification(app: PrescriptionVerifierApp):
+    """Render bulk prescription verification page"""
+    st.markdown("# 📦 Batch Verification")
+    st.markdown("**Upload a CSV or JSONL file of prescriptions to verify them in bulk**")
+    
+    st.info("""
+    **📄 Expected format:**
+    - **CSV:** columns `prescription_text` and optional `patient_age`
+    - **JSONL:** one object per line with `prescription_text` and optional `patient_age`
+    """)
+    
+    uploaded_file = st.file_uploader("**Upload prescriptions file:**", type=["csv", "jsonl"], key="batch_file")
+    
+    if uploaded_file is not None:
+        try:
+            items = parse_batch_file(uploaded_file)
+        except Exception as e:
+            st.error(f"❌ Could not read file: {str(e)}")
+            return
+        
+        st.success(f"📋 **Loaded {len(items)} prescriptions**")
+        
+        if st.button("🚀 Run Batch Verification", type="primary"):
+            progress = st.progress(0.0)
+            status = st.empty()
+            rows = [None] * len(items)
+            done = 0
+            
+            try:
+                for result in app.verify_batch(items):
+                    item = items[result["index"]]
+                    data = result.get("data", {})
+                    rows[result["index"]] = {
+                        "prescription_text": item["prescription_text"],
+                        "patient_age": item["patient_age"],
+                        "success": result["success"],
+                        "error": result.get("error"),
+                        "extracted_medicines": data.get("extracted_medicines", []),
+                        "total_interactions": data.get("total_interactions", 0),
+                        "results": data
+                    }
+                    done += 1
+                    progress.progress(done / max(len(items), 1))
+                    status.markdown(f"🔄 Verified **{done} / {len(items)}** prescriptions")
+                batch_error = "No result returned for this prescription"
+            except Exception as e:
+                batch_error = f"Batch aborted: {str(e)}"
+                st.error(f"❌ {batch_error}")
+            
+            # Keep one row per input so nothing silently disappears from the export
+            for index, row in enumerate(rows):
+                if row is None:
+                    rows[index] = {
+                        "prescription_text": items[index]["prescription_text"],
+                        "patient_age": items[index]["patient_age"],
+                        "success": False,
+                        "error": batch_error,
+                        "extracted_medicines": [],
+                        "total_interactions": 0,
+                        "results": {}
+                    }
+            
+            st.session_state.batch_results = rows
+            failed = sum(1 for row in rows if not row["success"])
+            status.markdown(f"✅ Verified **{len(rows) - failed}** prescriptions, **{failed}** failed")
+    
+    if st.session_state.get('batch_results'):
+        results = st.session_state.batch_results
+        summary_df = pd.DataFrame([
+            {
+                "Prescription": row["prescription_text"],
+                "Patient Age": row["patient_age"],
+                "Status": "✅ OK" if row["success"] else f"❌ {row['error']}",
+                "Medicines": ", ".join(row["extracted_medicines"]),
+                "Interactions": row["total_interactions"]
+            }
+            for row in results
+        ])
+        st.dataframe(summary_df, use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.download_button(
+                label="💾 Download JSONL Results",
+                data="\n".join(json.dumps(row) for row in results),
+                file_name=f"batch_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl",
+                mime="application/x-ndjson",
+                use_container_width=True
+            )
+        
+        with col2:
+            st.download_button(
+                label="📊 Download CSV Summary",
+                data=summary_df.to_csv(index=False),
+                file_name=f"batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv",
+                use_container_width=True
+            )
+
+def render_analysis_history(app: PrescriptionVerifierApp):
     """Render analysis history page"""
     st.markdown("# 📊 Analysis History")
     st.markdown("**View and manage your previous prescription analyses**")
     
-    if 'analysis_history' in st.session_state and st.session_state.analysis_history:
-        st.success(f"📈 **Found {len(st.session_state.analysis_history)} previous analyses**")
+    # Filters
+    col1, col2 = st.columns(2)
+    with col1:
+        analysis_type = st.selectbox("**📊 Type:**", ["All"] + app.history.types(app.history_owner), key="history_type")
+    with col2:
+        drug = st.text_input("**💊 Drug:**", placeholder="e.g. Warfarin", key="history_drug")
+    
+    analysis_type = None if analysis_type == "All" else analysis_type
+    drug = drug.strip() or None
+    total = app.history.count(app.history_owner, analysis_type, drug)
+    
+    if app.history_owner.startswith("token:"):
+        st.caption("🔖 Bookmark this page's address to come back to this history later")
+    
+    if total:
+        st.success(f"📈 **Found {total} previous analyses**")
+        
+        total_pages = (total + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE
+        page = st.number_input("**Page:**", min_value=1, max_value=total_pages, value=1, step=1, key="history_page")
+        offset = (page - 1) * HISTORY_PAGE_SIZE
         
-        for i, analysis in enumerate(reversed(st.session_state.analysis_history), 1):
+        for i, analysis in enumerate(app.history.list_page(app.history_owner, offset, HISTORY_PAGE_SIZE, analysis_type, drug), offset + 1):
             with st.expander(f"📋 **Analysis {i}** - {analysis.get('timestamp', 'Unknown time')}"):
                 st.markdown(f"**💬 Prescription:** {analysis.get('prescription', 'No prescription text')}")
                 st.markdown(f"**📊 Type:** {analysis.get('type', 'Unknown')}")
                 st.markdown(f"**⏰ Timestamp:** {analysis.get('timestamp', 'Not recorded')}")
                 
-                if analysis.get('results'):
-                    st.json(analysis['results'])
+                # Result bodies are only fetched when asked for
+                if st.checkbox("Show results", key=f"history_results_{analysis['id']}"):
+                    results = app.history.get_results(app.history_owner, analysis['id'])
+                    if results:
+                        st.json(results)
+        
+        st.caption(f"Page {page} of {total_pages}")
         
         # Clear history button
         if st.button("🗑️ Clear Analysis History", type="secondary"):
-            st.session_state.analysis_history = []
+            app.history.clear(app.history_owner)
             st.success("✅ Analysis history cleared!")
             st.rerun()
     else:
@@ -1116,6 +2287,88 @@ def render_analysis_history():
         Start by analyzing prescriptions using the Drug Interaction Checker or Dosage Checker to build your analysis history.
         """)
 
+def render_history_analytics(app: PrescriptionVerifierApp):
+    """Render dashboards over the stored analysis history"""
+    st.markdown("# 📈 History Analytics")
+    st.markdown("**Interaction trends, severity mix and response latency across stored analyses**")
+    
+    # Filters
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        today = datetime.now().date()
+        date_range = st.date_input("**📅 Date range:**", value=(today - timedelta(days=30), today), key="analytics_dates")
+    with col2:
+        drug = st.text_input("**💊 Drug:**", placeholder="e.g. Warfarin", key="analytics_drug")
+    with col3:
+        severity = st.selectbox("**🎯 Severity:**", ["All"] + app.history.severities(), key="analytics_severity")
+    with col4:
+        age_group = st.selectbox("**👤 Age group:**", ["All", "pediatric", "adult", "geriatric", "unknown"], key="analytics_age_group")
+    
+    if not isinstance(date_range, (list, tuple)) or len(date_range) != 2:
+        st.info("📅 Select a start and end date")
+        return
+    
+    start_day, end_day = (day.isoformat() for day in date_range)
+    drug = drug.strip() or None
+    severity = None if severity == "All" else severity
+    age_group = None if age_group == "All" else age_group
+    
+    # Aggregates only (no prescription text), so the dashboard covers every owner
+    rollup = app.history.interaction_rollup(start_day, end_day, drug, severity, age_group)
+    latencies = app.history.latencies(start_day, end_day, drug, age_group)
+    
+    if rollup.empty and latencies.size == 0:
+        st.info("📝 **No analyses match these filters**")
+        return
+    
+    # Interaction frequency per drug pair
+    if not rollup.empty:
+        col1, col2 = st.columns([3, 2])
+        
+        with col1:
+            st.markdown("## ⚠️ **Most Frequent Interactions**")
+            pairs = (
+                rollup.assign(pair=rollup["drug_a"].str.title() + " + " + rollup["drug_b"].str.title())
+                .groupby("pair", as_index=False)["count"].sum()
+                .nlargest(20, "count")
+                .sort_values("count")
+            )
+            fig = px.bar(pairs, x="count", y="pair", orientation="h", labels={"count": "Occurrences", "pair": ""})
+            st.plotly_chart(fig, use_container_width=True)
+        
+        with col2:
+            st.markdown("## 🎯 **Severity Distribution**")
+            severities = rollup.groupby("severity", as_index=False)["count"].sum()
+            fig = px.pie(
+                severities,
+                names="severity",
+                values="count",
+                color="severity",
+                color_discrete_map={"CRITICAL": "#dc2626", "WARNING": "#d97706"}
+            )
+            st.plotly_chart(fig, use_container_width=True)
+        
+        st.markdown("## 📅 **Interactions per Day**")
+        daily = rollup.groupby(["day", "severity"], as_index=False)["count"].sum()
+        fig = px.bar(daily, x="day", y="count", color="severity", labels={"count": "Interactions", "day": ""})
+        st.plotly_chart(fig, use_container_width=True)
+    
+    # Latency percentiles
+    if latencies.size:
+        st.markdown("## ⏱️ **Response Latency**")
+        st.caption("Filtered by date, drug and age group; latency is recorded per analysis, not per severity")
+        labels = ["p50", "p90", "p95", "p99"]
+        values = np.percentile(latencies, [50, 90, 95, 99])
+        
+        cols = st.columns(len(labels) + 1)
+        cols[0].metric("Analyses", f"{latencies.size}")
+        for col, label, value in zip(cols[1:], labels, values):
+            col.metric(label, f"{value:.0f} ms")
+        
+        fig = go.Figure(go.Bar(x=labels, y=values, marker_color="#3b82f6"))
+        fig.update_layout(yaxis_title="Latency (ms)")
+        st.plotly_chart(fig, use_container_width=True)
+
 def main():
     """Main application function"""
     # Initialize the app
@@ -1129,22 +2382,21 @@ def main():
     
     # Route to appropriate page
     if selected_page == "🏠 Home":
-        render_home_page()
+        render_home_page(app)
     elif selected_page == "🔍 Drug Interaction Checker":
         render_interaction_checker(app)
     elif selected_page == "💊 Dosage & Alternatives":
         render_dosage_checker(app)
+    elif selected_page == "📦 Batch Verification":
+        render_batch_verification(app)
     elif selected_page == "📊 Analysis History":
-        render_analysis_history()
+        render_analysis_history(app)
+    elif selected_page == "📈 History Analytics":
+        render_history_analytics(app)
     
     # Footer
     st.markdown("---")
-    st.markdown("""
-    <div style="text-align: center; color: #64748b; margin-top: 2rem;">
-        <p><strong>AI Prescription Verifier v1.0</strong> | Powered by Hugging Face Posos/ClinicalNER, IBM Watson & RxNorm</p>
-        <p>🏥 Enhancing medication safety through artificial intelligence</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(load_static_asset("footer.html"), unsafe_allow_html=True)
 
 if __name__ == "__main__":
     main()
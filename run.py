@@ -2,17 +2,98 @@
 """
 Run script for the AI Prescription Verifier application.
 This script provides an easy way to run the FastAPI application.
+
+Usage:
+    python run.py                    # development server with auto-reload
+    python run.py --prod             # production server, one worker per CPU core
+    python run.py --prod --workers 4
 """
 
+import argparse
+import multiprocessing
+import os
+
 import uvicorn
-from app.main import app
 
-if __name__ == "__main__":
+APP_MODULE = "app.main:app"
+
+
+def run_dev(host: str, port: int):
+    """Single-process development server with auto-reload"""
     uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
+        APP_MODULE,
+        host=host,
+        port=port,
         reload=True,
         reload_dirs=["app"],  # Only watch the app directory for changes
         log_level="info"
     )
+
+
+def run_prod(host: str, port: int, workers: int, graceful_timeout: int, max_requests: int):
+    """Multi-worker production server
+
+    Uses gunicorn with uvicorn workers when available so the application (and the
+    NER model it loads) is imported once in the master and shared copy-on-write
+    by the forked workers. Sending SIGHUP to the master restarts workers gracefully.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        # Without gunicorn each uvicorn worker imports the app on its own
+        print("gunicorn not installed; starting uvicorn workers without model preloading")
+        uvicorn.run(
+            APP_MODULE,
+            host=host,
+            port=port,
+            workers=workers,
+            reload=False,
+            log_level="info"
+        )
+        return
+
+    class PreloadedApplication(BaseApplication):
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            from app.main import app
+            return app
+
+    options = {
+        "bind": f"{host}:{port}",
+        "workers": workers,
+        "worker_class": "uvicorn.workers.UvicornWorker",
+        "preload_app": True,
+        "graceful_timeout": graceful_timeout,
+        "timeout": graceful_timeout * 4,
+        "max_requests": max_requests,
+        "max_requests_jitter": max_requests // 10,
+        "loglevel": "info"
+    }
+    PreloadedApplication(options).run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the AI Prescription Verifier API")
+    parser.add_argument("--prod", action="store_true", default=os.getenv("APP_ENV") == "production",
+                        help="run the multi-worker production server (reload disabled)")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count())),
+                        help="number of worker processes in production mode")
+    parser.add_argument("--graceful-timeout", type=int, default=int(os.getenv("GRACEFUL_TIMEOUT", "30")),
+                        help="seconds to let in-flight requests finish on restart/shutdown")
+    parser.add_argument("--max-requests", type=int, default=int(os.getenv("MAX_REQUESTS", "0")),
+                        help="recycle a worker after this many requests (0 disables)")
+    args = parser.parse_args()
+
+    if args.prod:
+        run_prod(args.host, args.port, args.workers, args.graceful_timeout, args.max_requests)
+    else:
+        run_dev(args.host, args.port)
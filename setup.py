@@ -28,6 +28,12 @@ setup(
         "ibm-watson>=7.0.1",
         "ibm-cloud-sdk-core>=3.16.1"
     ],
+    extras_require={
+        # Multi-worker production server (python run.py --prod)
+        "production": ["gunicorn>=21.2.0"],
+        # Frontend unit tests (python -m pytest)
+        "test": ["pytest>=7.0", "streamlit", "requests", "pandas", "plotly"]
+    },
     python_requires=">=3.8",
     author="Your Name",
     author_email="your.email@example.com",
@@ -0,0 +1,87 @@
+"""Tests for the span diffing and result deltas behind incremental re-analysis"""
+
+from frontend import compute_result_delta, diff_prescription_spans, split_prescription_spans
+
+
+def test_split_keeps_thousands_separators_in_one_span():
+    assert split_prescription_spans("Aspirin 1,000mg daily, Warfarin 5mg") == [
+        "Aspirin 1,000mg daily",
+        "Warfarin 5mg",
+    ]
+
+
+def test_split_keeps_decimals_in_one_span():
+    assert split_prescription_spans("Digoxin 0.25mg once daily; Warfarin 2.5 mg") == [
+        "Digoxin 0.25mg once daily",
+        "Warfarin 2.5 mg",
+    ]
+
+
+def test_split_on_lines_semicolons_commas_and_sentences():
+    text = "Aspirin 100mg\nWarfarin 5mg; Metformin 500mg,Lisinopril 10mg. Take with food"
+    assert split_prescription_spans(text) == [
+        "Aspirin 100mg",
+        "Warfarin 5mg",
+        "Metformin 500mg",
+        "Lisinopril 10mg.",
+        "Take with food",
+    ]
+
+
+def test_split_ignores_empty_spans():
+    assert split_prescription_spans(" ,\n; ") == []
+
+
+def test_diff_reports_changed_dose_as_replaced_span():
+    diff = diff_prescription_spans("Aspirin 1,000mg daily, Warfarin 5mg", "Aspirin 1,500mg daily, Warfarin 5mg")
+    assert diff == {
+        "added": ["Aspirin 1,500mg daily"],
+        "removed": ["Aspirin 1,000mg daily"],
+        "unchanged": ["Warfarin 5mg"],
+    }
+
+
+def test_diff_treats_reordered_clauses_as_unchanged():
+    diff = diff_prescription_spans("Aspirin 100mg, Warfarin 5mg", "Warfarin 5mg\nAspirin 100mg")
+    assert diff["added"] == []
+    assert diff["removed"] == []
+    assert sorted(diff["unchanged"]) == ["Aspirin 100mg", "Warfarin 5mg"]
+
+
+def test_diff_counts_repeated_spans():
+    diff = diff_prescription_spans("Aspirin 100mg, Aspirin 100mg", "Aspirin 100mg")
+    assert diff == {"added": [], "removed": ["Aspirin 100mg"], "unchanged": ["Aspirin 100mg"]}
+
+
+def test_diff_of_unrelated_text_has_nothing_unchanged():
+    diff = diff_prescription_spans("Aspirin 100mg", "Metformin 500mg")
+    assert diff == {"added": ["Metformin 500mg"], "removed": ["Aspirin 100mg"], "unchanged": []}
+
+
+def test_delta_treats_swapped_pairs_as_the_same_interaction():
+    previous = {"interactions": [{"drug_a": "Aspirin", "drug_b": "Warfarin", "severity": "HIGH"}]}
+    current = {"interactions": [{"drug_a": "warfarin", "drug_b": "ASPIRIN", "severity": "HIGH"}]}
+    delta = compute_result_delta(previous, current)
+    assert delta["added_interactions"] == []
+    assert delta["removed_interactions"] == []
+
+
+def test_delta_reports_added_and_removed_medicines_and_interactions():
+    previous = {
+        "extracted_medicines": ["Aspirin", "Warfarin"],
+        "interactions": [{"drug_a": "Aspirin", "drug_b": "Warfarin"}],
+    }
+    current = {
+        "extracted_medicines": ["warfarin", "Metformin"],
+        "interactions": [{"drug_a": "Metformin", "drug_b": "Warfarin"}],
+    }
+    delta = compute_result_delta(previous, current)
+    assert delta["added_medicines"] == ["Metformin"]
+    assert delta["removed_medicines"] == ["Aspirin"]
+    assert delta["added_interactions"] == [{"drug_a": "Metformin", "drug_b": "Warfarin"}]
+    assert delta["removed_interactions"] == [{"drug_a": "Aspirin", "drug_b": "Warfarin"}]
+
+
+def test_delta_from_empty_result_adds_everything():
+    current = {"extracted_medicines": ["Aspirin"], "interactions": []}
+    assert compute_result_delta({}, current)["added_medicines"] == ["Aspirin"]
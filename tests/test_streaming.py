@@ -0,0 +1,149 @@
+"""Tests for NDJSON batch results and Server-Sent Events parsing"""
+
+import json
+
+import pytest
+import requests
+import streamlit as st
+
+from frontend import PrescriptionVerifierApp, ResultCache, render_live_analysis
+
+
+class FakeResponse:
+    def __init__(self, lines, status_code=200, error=None):
+        self.lines = lines
+        self.status_code = status_code
+        self.text = ""
+        self.error = error
+        self.closed = False
+
+    def iter_lines(self, decode_unicode=False):
+        for line in self.lines:
+            yield line
+        if self.error is not None:
+            raise self.error
+
+    def close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class FakeClient:
+    def __init__(self, response):
+        self.response = response
+        self.unsupported = set()
+
+    def supports(self, path):
+        return path not in self.unsupported
+
+    def mark_unsupported(self, path):
+        self.unsupported.add(path)
+
+    def post(self, path, **kwargs):
+        return self.response
+
+
+def make_app(response):
+    app = PrescriptionVerifierApp.__new__(PrescriptionVerifierApp)
+    app.client = FakeClient(response)
+    app.result_cache = ResultCache(cache_dir=None)
+    app.api_headers = {}
+    return app
+
+
+def batch(count):
+    return [{"prescription_text": f"Aspirin {i}mg"} for i in range(count)]
+
+
+def test_verify_batch_yields_results_in_any_order():
+    lines = [
+        json.dumps({"index": 1, "result": {"total_interactions": 1}}),
+        json.dumps({"index": 0, "error": "bad prescription"}),
+    ]
+    results = list(make_app(FakeResponse(lines)).verify_batch(batch(2)))
+    assert results == [
+        {"index": 1, "success": True, "data": {"total_interactions": 1}},
+        {"index": 0, "success": False, "error": "bad prescription"},
+    ]
+
+
+def test_verify_batch_reports_every_item_despite_malformed_lines():
+    lines = [
+        "not json",
+        json.dumps({"result": {}}),            # missing index
+        json.dumps({"index": 7, "result": {}}),  # out of range
+        json.dumps({"index": 0, "result": {}}),
+        json.dumps({"index": 0, "result": {}}),  # duplicate
+        "",
+    ]
+    results = sorted(make_app(FakeResponse(lines)).verify_batch(batch(3)), key=lambda r: r["index"])
+    assert [r["index"] for r in results] == [0, 1, 2]
+    assert results[0]["success"]
+    for missing in results[1:]:
+        assert not missing["success"]
+        assert "4 malformed response line(s)" in missing["error"]
+
+
+def test_verify_batch_reports_interrupted_stream_for_missing_items():
+    response = FakeResponse([json.dumps({"index": 0, "result": {}})], error=requests.ConnectionError("reset"))
+    results = list(make_app(response).verify_batch(batch(2)))
+    assert results[0] == {"index": 0, "success": True, "data": {}}
+    assert results[1]["index"] == 1
+    assert results[1]["error"].startswith("Stream interrupted")
+
+
+def test_verify_batch_fails_every_item_on_api_error():
+    results = list(make_app(FakeResponse([], status_code=500)).verify_batch(batch(2)))
+    assert [r["success"] for r in results] == [False, False]
+
+
+def sse(event, data):
+    return [f"event: {event}", f"data: {json.dumps(data)}", ""]
+
+
+def test_stream_analysis_parses_events_and_skips_comments():
+    done = {"extracted_medicines": ["Aspirin"], "interactions": []}
+    lines = [": keep-alive", ""] + sse("medicines", {"extracted_medicines": ["Aspirin"]}) + sse("done", done)
+    app = make_app(FakeResponse(lines))
+    events = list(app.stream_analysis("check_interactions", "Aspirin 100mg"))
+    assert events == [("medicines", {"extracted_medicines": ["Aspirin"]}), ("done", done)]
+
+
+def test_stream_analysis_joins_multiline_data():
+    lines = ["event: done", 'data: {"total_interactions":', "data: 0}", ""]
+    events = list(make_app(FakeResponse(lines)).stream_analysis("check_interactions", "Aspirin"))
+    assert events == [("done", {"total_interactions": 0})]
+
+
+def test_stream_analysis_caches_only_completed_results():
+    app = make_app(FakeResponse(sse("medicines", {"extracted_medicines": ["Aspirin"]})))
+    list(app.stream_analysis("check_interactions", "Aspirin"))
+    assert app.result_cache.get(app.result_cache.make_key("check_interactions", "Aspirin")) is None
+
+    app.client.response = FakeResponse(sse("done", {"total_interactions": 0}))
+    list(app.stream_analysis("check_interactions", "Aspirin"))
+    assert list(app.stream_analysis("check_interactions", "Aspirin")) == [("cached", {"total_interactions": 0})]
+
+
+def test_live_analysis_without_done_event_fails():
+    lines = sse("medicines", {"extracted_medicines": ["Aspirin"]}) + sse(
+        "interaction", {"drug_a": "Aspirin", "drug_b": "Warfarin", "severity": "HIGH"}
+    )
+    result = render_live_analysis(make_app(FakeResponse(lines)), st.container(), "check_interactions", "Aspirin")
+    assert not result["success"]
+
+
+@pytest.mark.parametrize("event", ["done", "cached"])
+def test_live_analysis_with_final_event_succeeds(event):
+    app = make_app(FakeResponse(sse("done", {"interactions": []})))
+    if event == "cached":
+        list(app.stream_analysis("check_interactions", "Aspirin"))
+    result = render_live_analysis(app, st.container(), "check_interactions", "Aspirin")
+    assert result["success"]
+    assert result["data"]["total_interactions"] == 0
+    assert (result["latency_ms"] is None) == (event == "cached")